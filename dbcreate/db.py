@@ -1,16 +1,137 @@
+import csv
 import sqlite3
-import pandas as pd
-from typing import Optional
+import itertools
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence
 
 DB_PATH = 'timetable.db'
+SQLITE_MAX_VARIABLES = 999  # SQLITE_MAX_VARIABLE_NUMBER on older SQLite builds
+MISSING = (None, '', 'nan')
+READ_BUFFER_SIZE = 1 << 20  # 1 MiB reads instead of the 8 KiB default
+_STRIP_WHITESPACE = str.maketrans('', '', ' \t\r\n')
 
-def create_database(path: str = DB_PATH) -> sqlite3.Connection:
-    """Create database and required tables; returns a connection."""
-    conn = sqlite3.connect(path)
+_COURSE_COLS = ('course_id', 'course_name', 'credits', 'course_type')
+_ROOM_COLS = ('room_id', 'room_type', 'room_capacity')
+_INSTRUCTOR_COLS = ('instructor_id', 'instructor_name', 'preferred_slots')
+_TIMETABLE_COLS = ('day', 'start_time', 'end_time', 'start_min', 'end_min', 'slot_mask', 'level')
+SLOT_MINUTES = 30  # slot_mask granularity: one bit per half hour of the day
+_QUALIFIED_COLS = ('instructor_id', 'course_id')
+
+# Key indexes that bulk_load mode builds once after the data is in place
+_KEY_INDEXES = [
+    ('idx_courses_id', 'courses(course_id)'),
+    ('idx_rooms_id', 'rooms(room_id)'),
+    ('idx_instructors_id', 'instructors(instructor_id)'),
+    ('idx_qualified_courses_key', 'qualified_courses(instructor_id, course_id)')
+]
+
+# Lookup indexes built after every load. The timetable ones mirror
+# TIMETABLE_INDICES in src/database/query_optimizer.py, which also drops
+# superseded indexes from older databases on first open
+_LOOKUP_INDEXES = [
+    ('idx_timetable_course', 'timetable(course_id)'),
+    ('idx_timetable_day_time', 'timetable(day, start_time, end_time)'),
+    ('idx_timetable_room_day', 'timetable(room_id, day, start_time, end_time)'),
+    ('idx_timetable_instructor_day', 'timetable(instructor_id, day, start_time, end_time)'),
+    ('idx_timetable_level_day', 'timetable(level, day, start_time, end_time)'),
+    ('idx_qc_instr', 'qualified_courses(instructor_id)')
+]
+
+def _column(header: Sequence[str], key: str, default: Any = None) -> Callable[[List[str]], Any]:
+    """Build a getter for one CSV column, resolving its position once from the header.
+
+    Empty cells become None; if the column is absent the getter returns default.
+    """
+    if key not in header:
+        return lambda row: default
+    index = list(header).index(key)
+
+    def get(row: List[str]) -> Any:
+        value = row[index] if index < len(row) else None
+        return None if value in MISSING else value
+    return get
+
+def to_minutes(value: Optional[str]) -> Optional[int]:
+    """Convert 'H:MM' / 'HH:MM' to minutes since midnight; None if it is not a time.
+
+    Unparseable cells keep their text in start_time/end_time, as before the
+    integer columns existed, and the validators fall back to that text.
+    """
+    if value is None:
+        return None
+    try:
+        hours, minutes = value.split(':')[:2]
+        return int(hours) * 60 + int(minutes)
+    except ValueError:
+        return None
+
+def _minutes_sql(column: str) -> str:
+    """SQL equivalent of to_minutes() for a text column (NULL if unparseable)."""
+    return (f"(CASE WHEN {column} GLOB '[0-9]:[0-5][0-9]*' "
+            f"OR {column} GLOB '[0-9][0-9]:[0-5][0-9]*' THEN "
+            f"CAST(substr({column}, 1, instr({column}, ':') - 1) AS INTEGER) * 60 + "
+            f"CAST(substr({column}, instr({column}, ':') + 1, 2) AS INTEGER) END)")
+
+# Fill the integer time columns for rows written before they existed;
+# slot_mask as in slot_mask()
+_BACKFILL_MINUTES_SQL = f"""
+    UPDATE timetable
+    SET start_min = {_minutes_sql('start_time')},
+        end_min = {_minutes_sql('end_time')}
+    WHERE start_min IS NULL OR end_min IS NULL
+"""
+_BACKFILL_MASK_SQL = f"""
+    UPDATE timetable
+    SET slot_mask = ((1 << ((end_min - 1) / {SLOT_MINUTES} - start_min / {SLOT_MINUTES} + 1)) - 1)
+                    << (start_min / {SLOT_MINUTES})
+    WHERE slot_mask IS NULL AND start_min IS NOT NULL AND end_min > start_min
+"""
+
+def slot_mask(start_min: Optional[int], end_min: Optional[int]) -> Optional[int]:
+    """Bitmap of the half-hour blocks touched by [start_min, end_min).
+
+    Two slots can only overlap if their masks share a bit, so the mask is a
+    cheap pre-filter ahead of the exact minute comparison.
+    """
+    if start_min is None or end_min is None or end_min <= start_min:
+        return None
+    first, last = start_min // SLOT_MINUTES, (end_min - 1) // SLOT_MINUTES
+    return ((1 << (last - first + 1)) - 1) << first
+
+def apply_pragmas(conn: sqlite3.Connection, bulk_load: bool = False) -> None:
+    """Tune journaling, syncing and caching; bulk_load trades durability for speed."""
+    if bulk_load:
+        conn.execute('PRAGMA journal_mode=MEMORY')
+        conn.execute('PRAGMA synchronous=OFF')
+    else:
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+    conn.execute('PRAGMA temp_store=MEMORY')
+    conn.execute('PRAGMA cache_size=-65536')  # 64 MiB
+    conn.execute('PRAGMA mmap_size=268435456')
+
+def create_database(path: str = DB_PATH,
+                    bulk_load: bool = False,
+                    check_same_thread: bool = True) -> sqlite3.Connection:
+    """Create database and required tables; returns a connection.
+
+    With bulk_load, newly created tables get no key constraints; call
+    create_key_indexes() once the data is loaded to build them in one pass.
+    The schema is then left in an open transaction, so keyless tables are
+    only committed together with the data and their key indexes.
+    """
+    conn = sqlite3.connect(path, check_same_thread=check_same_thread)
+    apply_pragmas(conn, bulk_load)
+    if bulk_load:
+        conn.execute('BEGIN')
+    key = '' if bulk_load else ' PRIMARY KEY'
+    qualified_key = '' if bulk_load else ',\n        PRIMARY KEY (instructor_id, course_id)'
     cur = conn.cursor()
-    cur.execute('''
+    cur.execute(f'''
     CREATE TABLE IF NOT EXISTS courses (
-        course_id TEXT PRIMARY KEY,
+        course_id TEXT{key},
         course_name TEXT NOT NULL,
         credits REAL NOT NULL,
         course_type TEXT NOT NULL
@@ -21,6 +142,9 @@ def create_database(path: str = DB_PATH) -> sqlite3.Connection:
         day TEXT NOT NULL,
         start_time TEXT NOT NULL,
         end_time TEXT NOT NULL,
+        start_min INTEGER,
+        end_min INTEGER,
+        slot_mask INTEGER,
         level INTEGER,
         room_id TEXT,
         course_id TEXT,
@@ -29,105 +153,253 @@ def create_database(path: str = DB_PATH) -> sqlite3.Connection:
         FOREIGN KEY (course_id) REFERENCES courses (course_id),
         FOREIGN KEY (instructor_id) REFERENCES instructors (instructor_id)
     )''')
-    cur.execute('''
+    cur.execute(f'''
     CREATE TABLE IF NOT EXISTS rooms (
-        room_id TEXT PRIMARY KEY,
+        room_id TEXT{key},
         room_type TEXT NOT NULL,
         room_capacity INTEGER
     )''')
-    cur.execute('''
+    cur.execute(f'''
     CREATE TABLE IF NOT EXISTS instructors (
-        instructor_id TEXT PRIMARY KEY,
+        instructor_id TEXT{key},
         instructor_name TEXT NOT NULL,
         preferred_slots TEXT
     )''')
-    cur.execute('''
+    cur.execute(f'''
     CREATE TABLE IF NOT EXISTS qualified_courses (
         instructor_id TEXT,
-        course_id TEXT,
-        PRIMARY KEY (instructor_id, course_id)
+        course_id TEXT{qualified_key}
     )''')
-    conn.commit()
+    # databases created before the integer time columns existed
+    existing = {row[1] for row in cur.execute('PRAGMA table_info(timetable)')}
+    added = [column for column in ('start_min', 'end_min', 'slot_mask')
+             if column not in existing]
+    for column in added:
+        cur.execute(f'ALTER TABLE timetable ADD COLUMN {column} INTEGER')
+    # one-time fill for the rows already there; later loads write the columns
+    if added:
+        cur.execute(_BACKFILL_MINUTES_SQL)
+        cur.execute(_BACKFILL_MASK_SQL)
+    if not bulk_load:
+        conn.commit()
     return conn
 
-def load_data(csv_file: str, db_path: str = DB_PATH) -> None:
-    """Load data from a CSV into the database. Expects columns used in parser."""
-    df = pd.read_csv(csv_file)
-    conn = create_database(db_path)
-    cur = conn.cursor()
+@contextmanager
+def db_session(path: str = DB_PATH, bulk_load: bool = False) -> Iterator[sqlite3.Connection]:
+    """Open one tuned connection with the schema in place; commit on exit."""
+    conn = create_database(path, bulk_load)
     try:
-        # courses
-        for _, row in df.iterrows():
-            cid = row.get('course_id')
-            if pd.notna(cid):
-                cur.execute('''
-                    INSERT OR REPLACE INTO courses (course_id, course_name, credits, course_type)
-                    VALUES (?, ?, ?, ?)
-                ''', (cid, row.get('course_name', ''), row.get('credits', 0), row.get('course_type', 'Lecture')))
-        # rooms
-        for _, row in df.iterrows():
-            room_id = row.get('Space')
-            if pd.isna(room_id):
-                continue
-            room_type = row.get('Type')
-            cap_raw = row.get('Capacity')
-            room_capacity = None
-            if pd.notna(cap_raw):
-                try:
-                    room_capacity = int(cap_raw)
-                except Exception:
-                    room_capacity = None
-            cur.execute('''
-                INSERT OR REPLACE INTO rooms (room_id, room_type, room_capacity)
-                VALUES (?, ?, ?)
-            ''', (room_id, room_type, room_capacity))
-        # instructors
-        for _, row in df.iterrows():
-            iid = row.get('instructor_id')
-            if pd.notna(iid):
-                name = row.get('instructor_name') or row.get('name') or ''
-                prefs = row.get('preferred_slots') if 'preferred_slots' in df.columns else None
-                cur.execute('''
-                    INSERT OR REPLACE INTO instructors (instructor_id, instructor_name, preferred_slots)
-                    VALUES (?, ?, ?)
-                ''', (iid, name, prefs))
-        # timetable rows
-        for level in range(1, 5):
-            for _, row in df.iterrows():
-                if pd.notna(row.get('Day')):
-                    cur.execute('''
-                        INSERT INTO timetable (day, start_time, end_time, level)
-                        VALUES (?, ?, ?, ?)
-                    ''', (row.get('Day'), row.get('start_time'), row.get('end_time'), level))
-        # qualified courses (comma-separated like "MTH111,MTH212")
-        if 'qualified_courses' in df.columns:
-            instr_cols = ['instructor_id', 'Instructor', 'instructor']
-            for _, row in df.iterrows():
-                # try common instructor id column names
-                iid = next((row.get(c) for c in instr_cols if c in df.columns), None)
-                if pd.isna(iid) or iid is None:
-                    continue
-                q = row.get('qualified_courses')
-                if pd.isna(q):
-                    continue
-                for token in str(q).split(','):
-                    course_code = token.strip()
-                    if not course_code:
-                        continue
-                    cur.execute('''
-                        INSERT OR IGNORE INTO qualified_courses (instructor_id, course_id)
-                        VALUES (?, ?)
-                    ''', (iid, course_code))
+        yield conn
         conn.commit()
-    except Exception as e:
+    except Exception:
         conn.rollback()
         raise
     finally:
         conn.close()
 
+def create_key_indexes(cur: sqlite3.Cursor) -> None:
+    """Build the unique key indexes deferred by a bulk_load schema."""
+    for index_name, index_cols in _KEY_INDEXES:
+        cur.execute(f"CREATE UNIQUE INDEX IF NOT EXISTS {index_name} ON {index_cols}")
+
+def create_lookup_indexes(cur: sqlite3.Cursor) -> None:
+    """Build the lookup indexes used by timetable and qualification queries."""
+    for index_name, index_cols in _LOOKUP_INDEXES:
+        cur.execute(f"CREATE INDEX IF NOT EXISTS {index_name} ON {index_cols}")
+
+@lru_cache(maxsize=None)
+def _insert_sql(table: str, cols: Sequence[str], n_rows: int, conflict: Optional[str]) -> str:
+    """Build (once) the INSERT statement for n_rows rows so sqlite3 reuses its prepared form."""
+    verb = f"INSERT OR {conflict}" if conflict else "INSERT"
+    group = "(" + ", ".join("?" * len(cols)) + ")"
+    return f"{verb} INTO {table} ({', '.join(cols)}) VALUES " + ", ".join([group] * n_rows)
+
+def bulk_insert(cur: sqlite3.Cursor,
+                table: str,
+                cols: Sequence[str],
+                rows: Iterable[tuple],
+                chunk: int = 500,
+                conflict: Optional[str] = 'REPLACE') -> None:
+    """Insert rows using multi-row VALUES statements sized to SQLite's parameter limit."""
+    rows = list(rows)
+    if not rows:
+        return
+    cols = tuple(cols)
+    step = max(1, min(chunk, SQLITE_MAX_VARIABLES // len(cols)))
+    full = len(rows) - len(rows) % step
+    if full:
+        cur.executemany(_insert_sql(table, cols, step, conflict), (
+            tuple(itertools.chain.from_iterable(rows[i:i + step]))
+            for i in range(0, full, step)
+        ))
+    if full < len(rows):
+        # leftover rows use the single-row statement
+        cur.executemany(_insert_sql(table, cols, 1, conflict), rows[full:])
+
+def _write_batch(cur: sqlite3.Cursor,
+                 keyed: Optional[Sequence[Dict]],
+                 timetable_rows: List[tuple]) -> None:
+    """Write one flushed batch: the keyed tables (if any) then the timetable rows."""
+    if keyed is not None:
+        course_rows, room_rows, instructor_rows, qualified_rows = keyed
+        bulk_insert(cur, 'courses', _COURSE_COLS, course_rows.values())
+        bulk_insert(cur, 'rooms', _ROOM_COLS, room_rows.values())
+        bulk_insert(cur, 'instructors', _INSTRUCTOR_COLS, instructor_rows.values())
+        bulk_insert(cur, 'qualified_courses', _QUALIFIED_COLS, qualified_rows,
+                    conflict='IGNORE')
+    bulk_insert(cur, 'timetable', _TIMETABLE_COLS, timetable_rows, conflict=None)
+
+def load_data(csv_file: str,
+              db_path: str = DB_PATH,
+              bulk_load: bool = False,
+              chunksize: int = 10_000,
+              conn: Optional[sqlite3.Connection] = None) -> None:
+    """Load data from a CSV into the database. Expects columns used in parser.
+
+    Rows are streamed and flushed every ``chunksize`` rows inside a single
+    transaction, so memory stays bounded by the chunk rather than the file.
+    Keyed rows are de-duplicated in Python (last write wins, as with INSERT OR
+    REPLACE); with bulk_load they are written once at the end, followed by
+    the deferred key indexes.
+
+    When load_data opens the connection itself, each batch is written on a
+    background thread while the next chunk is parsed (sqlite3 releases the
+    GIL while stepping statements); at most one batch is in flight.
+
+    Pass ``conn`` (e.g. from db_session) to load through an existing
+    connection; it is then written to inline inside a savepoint of the
+    caller's transaction, which is left open for the caller to commit.
+    """
+    owns_conn = conn is None
+    if conn is None:
+        conn = create_database(db_path, bulk_load, check_same_thread=False)
+    cur = conn.cursor()
+    writer = ThreadPoolExecutor(max_workers=1) if owns_conn else None
+    pending: Optional[Future] = None
+    course_rows: Dict[str, tuple] = {}
+    room_rows: Dict[str, tuple] = {}
+    instructor_rows: Dict[str, tuple] = {}
+    qualified_rows: Dict[tuple, None] = {}
+    timetable_rows: List[tuple] = []
+
+    def wait() -> None:
+        nonlocal pending
+        if pending is not None:
+            pending, done = None, pending
+            done.result()
+
+    def flush(final: bool = False) -> None:
+        nonlocal course_rows, room_rows, instructor_rows, qualified_rows, timetable_rows, pending
+        # hand the filled buffers to the writer and start parsing into fresh ones
+        keyed = None
+        if final or not bulk_load:
+            keyed = (course_rows, room_rows, instructor_rows, qualified_rows)
+            course_rows, room_rows, instructor_rows, qualified_rows = {}, {}, {}, {}
+        batch, timetable_rows = timetable_rows, []
+        wait()
+        if writer is None:
+            _write_batch(cur, keyed, batch)
+        else:
+            pending = writer.submit(_write_batch, cur, keyed, batch)
+
+    try:
+        if not conn.in_transaction:
+            conn.execute('BEGIN')
+        if not owns_conn:
+            conn.execute('SAVEPOINT load_data')
+        with open(csv_file, newline='', buffering=READ_BUFFER_SIZE, encoding='utf-8') as f:
+            reader = csv.reader(f)
+            columns = next(reader, [])
+            course_id_of = _column(columns, 'course_id')
+            course_name_of = _column(columns, 'course_name', '')
+            credits_of = _column(columns, 'credits', 0)
+            course_type_of = _column(columns, 'course_type', 'Lecture')
+            space_of = _column(columns, 'Space')
+            capacity_of = _column(columns, 'Capacity')
+            room_type_of = _column(columns, 'Type')
+            instructor_id_of = _column(columns, 'instructor_id')
+            instructor_name_of = _column(columns, 'instructor_name')
+            name_of = _column(columns, 'name')
+            preferred_slots_of = _column(columns, 'preferred_slots')
+            day_of = _column(columns, 'Day')
+            start_time_of = _column(columns, 'start_time')
+            end_time_of = _column(columns, 'end_time')
+            qualified_of = _column(columns, 'qualified_courses')
+            # qualified courses need an instructor id; try common column names
+            qualified_iid_of = None
+            if 'qualified_courses' in columns:
+                instr_col = next((c for c in ('instructor_id', 'Instructor', 'instructor')
+                                  if c in columns), None)
+                if instr_col is not None:
+                    qualified_iid_of = _column(columns, instr_col)
+            for n, row in enumerate(reader, 1):
+                course_id = course_id_of(row)
+                if course_id is not None:
+                    course_rows[course_id] = (course_id, course_name_of(row),
+                                              credits_of(row), course_type_of(row))
+                room_id = space_of(row)
+                if room_id is not None:
+                    cap_raw = capacity_of(row)
+                    room_capacity = None
+                    if cap_raw is not None:
+                        try:
+                            room_capacity = int(float(cap_raw))
+                        except Exception:
+                            room_capacity = None
+                    room_rows[room_id] = (room_id, room_type_of(row), room_capacity)
+                instructor_id = instructor_id_of(row)
+                if instructor_id is not None:
+                    instructor_rows[instructor_id] = (
+                        instructor_id,
+                        instructor_name_of(row) or name_of(row) or '',
+                        preferred_slots_of(row)
+                    )
+                # timetable rows, one copy of each slot per level
+                day = day_of(row)
+                if day is not None:
+                    start, end = start_time_of(row), end_time_of(row)
+                    start_min, end_min = to_minutes(start), to_minutes(end)
+                    mask = slot_mask(start_min, end_min)
+                    timetable_rows.extend((day, start, end, start_min, end_min, mask, level)
+                                          for level in range(1, 5))
+                # qualified courses (comma-separated like "MTH111,MTH212")
+                if qualified_iid_of is not None:
+                    iid = qualified_iid_of(row)
+                    q = qualified_of(row)
+                    if iid is not None and q is not None:
+                        # course IDs never contain spaces, so drop all whitespace up front
+                        tokens = q.translate(_STRIP_WHITESPACE).split(',')
+                        qualified_rows.update(((iid, token), None) for token in tokens if token)
+                if n % chunksize == 0:
+                    flush()
+        flush(final=True)
+        wait()
+        if bulk_load:
+            create_key_indexes(cur)
+        create_lookup_indexes(cur)
+        if owns_conn:
+            conn.commit()
+        else:
+            conn.execute('RELEASE load_data')
+    except Exception:
+        if writer is not None:
+            writer.shutdown(wait=True)
+        if owns_conn:
+            conn.rollback()
+        else:
+            # undo only this load; the caller's earlier writes stay pending
+            conn.execute('ROLLBACK TO load_data')
+            conn.execute('RELEASE load_data')
+        raise
+    finally:
+        if writer is not None:
+            writer.shutdown(wait=True)
+        if owns_conn:
+            conn.close()
+
 def main():
     try:
-        load_data('aapl-adham.csv')
+        load_data('aapl-adham.csv', bulk_load=True)
         print("Loaded data.")
     except Exception as e:
         print(f"Error loading data: {e}")
@@ -1,7 +1,8 @@
+from collections import defaultdict
 from abc import ABC, abstractmethod
-from typing import List, Set, Dict, Optional
+from typing import Iterable, List, Set, Dict, Optional, Tuple
 from dataclasses import dataclass
-from .variable import Variable, TimeSlot
+from .variable import Variable
 from .domain import Domain
 
 @dataclass
@@ -25,20 +26,55 @@ class Constraint(ABC):
         """Propagate constraint effects to domain"""
         pass
 
+def _overlapping_pairs(variables: List[Variable],
+                       buckets: Iterable[List[int]]) -> Set[Tuple[int, int]]:
+    """Index pairs (i < j) whose assigned times overlap within a bucket.
+
+    Each bucket is swept in start order, pairing every entry with the
+    still-open ones, so only actually overlapping pairs are compared.
+    """
+    pairs: Set[Tuple[int, int]] = set()
+    for indices in buckets:
+        if len(indices) < 2:
+            continue
+        indices.sort(key=lambda i: variables[i]._assigned_time.start_time)
+        open_entries: List[int] = []
+        for index in indices:
+            slot = variables[index]._assigned_time
+            open_entries = [
+                other for other in open_entries
+                if variables[other]._assigned_time.end_time > slot.start_time
+            ]
+            pairs.update(
+                (min(other, index), max(other, index)) for other in open_entries
+                if variables[other]._assigned_time.start_time < slot.end_time
+            )
+            open_entries.append(index)
+    return pairs
+
 class NoOverlapConstraint(Constraint):
     """Ensures no resource conflicts"""
     
     def check(self, variables: List[Variable], domain: Domain) -> List[ConstraintViolation]:
+        # Bucket assignments by (resource, day); only bucket-mates can conflict
+        buckets: Dict[tuple, List[int]] = {}
+        for index, var in enumerate(variables):
+            if not var.is_assigned or var._assigned_time is None:
+                continue
+            day = var._assigned_time.day
+            buckets.setdefault(('room', var._assigned_room, day), []).append(index)
+            buckets.setdefault(('instructor', var._assigned_instructor, day), []).append(index)
+        
+        # A pair sharing both room and instructor is kept once
         violations = []
-        for i, var1 in enumerate(variables):
-            for var2 in variables[i+1:]:
-                if var1.conflicts_with(var2):
-                    violations.append(ConstraintViolation(
-                        constraint_type="resource_overlap",
-                        description=f"Resource conflict between {var1.course_id} and {var2.course_id}",
-                        variables=[var1, var2],
-                        severity=1.0
-                    ))
+        for i, j in sorted(_overlapping_pairs(variables, buckets.values())):
+            var1, var2 = variables[i], variables[j]
+            violations.append(ConstraintViolation(
+                constraint_type="resource_overlap",
+                description=f"Resource conflict between {var1.course_id} and {var2.course_id}",
+                variables=[var1, var2],
+                severity=1.0
+            ))
         return violations
     
     def propagate(self, variable: Variable, domain: Domain) -> bool:
@@ -73,10 +109,7 @@ class RoomTypeConstraint(Constraint):
     def propagate(self, variable: Variable, domain: Domain) -> bool:
         """Remove incompatible rooms from domain"""
         times, rooms, instructors = variable.get_domain()
-        compatible_rooms = {
-            room_id for room_id in rooms
-            if domain.rooms[room_id].room_type == variable.requirements.room_type
-        }
+        compatible_rooms = rooms & domain.rooms_of_type(variable.requirements.room_type)
         variable.reduce_domain(rooms=rooms - compatible_rooms)
         return len(compatible_rooms) > 0
 
@@ -84,25 +117,22 @@ class LevelConstraint(Constraint):
     """Ensures level-appropriate scheduling"""
     
     def check(self, variables: List[Variable], domain: Domain) -> List[ConstraintViolation]:
-        violations = []
-        level_times: Dict[int, Set[TimeSlot]] = {}
-        
-        for var in variables:
+        level_days: Dict[Tuple[int, str], List[int]] = defaultdict(list)
+        for index, var in enumerate(variables):
             if var.is_assigned and var._assigned_time:  # Add None check
-                if var.level not in level_times:
-                    level_times[var.level] = set()
-                
-                # Check for overlapping times within same level
-                if any(var._assigned_time.overlaps(t) for t in level_times[var.level]):
-                    violations.append(ConstraintViolation(
-                        constraint_type="level_time_conflict",
-                        description=f"Time conflict in level {var.level}",
-                        variables=[var],
-                        severity=1.0
-                    ))
-                level_times[var.level].add(var._assigned_time)
+                level_days[(var.level, var._assigned_time.day)].append(index)
         
-        return violations
+        # A variable conflicts if it overlaps any earlier one in the same level
+        conflicting = {j for _, j in _overlapping_pairs(variables, level_days.values())}
+        return [
+            ConstraintViolation(
+                constraint_type="level_time_conflict",
+                description=f"Time conflict in level {variables[j].level}",
+                variables=[variables[j]],
+                severity=1.0
+            )
+            for j in sorted(conflicting)
+        ]
     
     def propagate(self, variable: Variable, domain: Domain) -> bool:
         """No specific propagation needed for level constraint"""
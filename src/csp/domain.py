@@ -1,15 +1,25 @@
+import json
+import sys
+from bisect import bisect_left
 from dataclasses import dataclass, field
-from typing import Dict, Set, List, Optional
+from functools import lru_cache
+from typing import Dict, FrozenSet, Set, List, Optional, Tuple
 from datetime import time
 from .variable import TimeSlot, ResourceRequirements
 
+@lru_cache(maxsize=None)
+def parse_time(value: str) -> time:
+    """Parse 'H:MM' / 'HH:MM[:SS]' strings; cached since slot times repeat"""
+    hours, minutes = value.split(':')[:2]
+    return time(int(hours), int(minutes))
+
 @dataclass
 class RoomAvailability:
     """Tracks room availability and constraints"""
     room_id: str
     room_type: str
     capacity: int
-    available_times: List[TimeSlot] = field(default_factory=list)
+    available_times: Set[TimeSlot] = field(default_factory=set)
     features: Dict[str, bool] = field(default_factory=dict)
 
 @dataclass
@@ -18,7 +28,7 @@ class InstructorAvailability:
     instructor_id: str
     max_hours_per_day: int = 6
     preferred_times: List[TimeSlot] = field(default_factory=list)
-    available_times: List[TimeSlot] = field(default_factory=list)
+    available_times: Set[TimeSlot] = field(default_factory=set)
 
 class Domain:
     """Manages available values for CSP variables"""
@@ -28,29 +38,53 @@ class Domain:
         self.time_slots: List[TimeSlot] = list()
         self.rooms: Dict[str, RoomAvailability] = {}
         self.instructors: Dict[str, InstructorAvailability] = {}
+        # room_type -> [(capacity, room_id)] sorted by capacity; built lazily
+        self._rooms_by_type: Dict[str, List[Tuple[int, str]]] = {}
+        self._room_ids_by_type: Dict[str, FrozenSet[str]] = {}
+        self._indexed_rooms: Optional[Dict[str, RoomAvailability]] = None
+        self._indexed_count = 0
+        # (room_type, min_capacity) -> suitable room ids; reset with the index
+        self._suitable_rooms: Dict[Tuple[str, int], FrozenSet[str]] = {}
+        self._teaching_instructors: FrozenSet[str] = frozenset()
+        self._teaching_from: Optional[Dict[str, InstructorAvailability]] = None
+        self._teaching_count = 0
+        self._time_slots_frozen: FrozenSet[TimeSlot] = frozenset()
+        self._frozen_from: Optional[List[TimeSlot]] = None
+        self._frozen_count = 0
         self._load_domain_data()
     
+    def __getstate__(self) -> dict:
+        """Pickle without the database handle (used by the portfolio solver)"""
+        state = self.__dict__.copy()
+        state['db_manager'] = None
+        return state
+    
     def _load_domain_data(self) -> None:
         """Load all domain data from database"""
+        # IDs, days and room types repeat across rows and are compared and
+        # hashed constantly by the solver, so keep one interned copy of each
+        intern = sys.intern
+        
         # Load time slots
         result = self.db_manager.read_records('timetable', {'level': None})
         if result.success and result.data:
             for row in result.data:
                 self.time_slots.append(TimeSlot(
-                    day=row[1],  # day
-                    start_time=time.fromisoformat(row[2]),  # start_time
-                    end_time=time.fromisoformat(row[3])     # end_time
+                    day=intern(row['day']),
+                    start_time=parse_time(row['start_time']),
+                    end_time=parse_time(row['end_time'])
                 ))
         
         # Load rooms
         result = self.db_manager.read_records('rooms')
         if result.success and result.data:
             for row in result.data:
-                self.rooms[row[0]] = RoomAvailability(
-                    room_id=row[0],
-                    room_type=row[1],
-                    capacity=row[2],
-                    available_times=self.time_slots.copy()
+                room_id = intern(row['room_id'])
+                self.rooms[room_id] = RoomAvailability(
+                    room_id=room_id,
+                    room_type=intern(row['room_type']),
+                    capacity=row['room_capacity'],
+                    available_times=set(self.time_slots)
                 )
         
         # Load instructors
@@ -58,59 +92,139 @@ class Domain:
         if result.success and result.data:
             for row in result.data:
                 preferred_slots = []
-                if row[2]:  # preferred_slots column
+                if row['preferred_slots']:
                     # Assuming preferred slots are stored as JSON
-                    import json
-                    prefs = json.loads(row[2])
-                    preferred_slots = [
-                        ts for ts in self.time_slots
-                        if self._matches_preference(ts, prefs)
-                    ]
+                    preferred_slots = self._preferred_slots(row['preferred_slots'])
                 
-                self.instructors[row[0]] = InstructorAvailability(
-                    instructor_id=row[0],
-                    available_times=self.time_slots.copy(),
+                instructor_id = intern(row['instructor_id'])
+                self.instructors[instructor_id] = InstructorAvailability(
+                    instructor_id=instructor_id,
+                    available_times=set(self.time_slots),
                     preferred_times=preferred_slots
                 )
+        
+        self.invalidate()
     
-    def _matches_preference(self, time_slot: TimeSlot, prefs: Dict) -> bool:
-        """Check if time slot matches instructor preferences"""
-        return (time_slot.day in prefs.get('days', []) and
-                time_slot.start_time >= time.fromisoformat(prefs.get('earliest', '08:00')) and
-                time_slot.end_time <= time.fromisoformat(prefs.get('latest', '18:00')))
+    def invalidate(self) -> None:
+        """Drop the derived indexes; call after changing rooms or instructors in place"""
+        self._indexed_rooms = None
+        self._suitable_rooms = {}
+        self._teaching_from = None
+        self._freeze_time_slots()
+    
+    def _freeze_time_slots(self) -> None:
+        """Rebuild the shared frozenset of time slots"""
+        self._time_slots_frozen = frozenset(self.time_slots)
+        self._frozen_from = self.time_slots
+        self._frozen_count = len(self.time_slots)
+    
+    def _preferred_slots(self, raw: str) -> List[TimeSlot]:
+        """Time slots matching stored preferences (days, earliest, latest).
+
+        The bounds are parsed once per instructor and compared against each
+        slot's precomputed minutes, so the scan is plain int comparisons.
+        """
+        prefs = json.loads(raw)
+        days = frozenset(map(sys.intern, prefs.get('days', ())))
+        earliest = parse_time(prefs.get('earliest', '08:00'))
+        latest = parse_time(prefs.get('latest', '18:00'))
+        earliest_min = earliest.hour * 60 + earliest.minute
+        latest_min = latest.hour * 60 + latest.minute
+        return [
+            ts for ts in self.time_slots
+            if (ts.day in days and
+                ts.start_minute >= earliest_min and
+                ts.end_minute <= latest_min)
+        ]
     
     def get_available_values(self, 
                            requirements: ResourceRequirements
-                           ) -> tuple[Set[TimeSlot], Set[str], Set[str]]:
+                           ) -> tuple[FrozenSet[TimeSlot], FrozenSet[str], FrozenSet[str]]:
         """Get available values matching requirements"""
-        # Convert time_slots list to set
-        available_times = set(self.time_slots)  # Convert List to Set
+        # Shared, immutable view of the time slots; variables reduce it by
+        # rebinding (-=), which never touches the shared set
+        if (self._frozen_from is not self.time_slots or
+                self._frozen_count != len(self.time_slots)):
+            self._freeze_time_slots()
+        available_times = self._time_slots_frozen
         
-        # Filter rooms by type and capacity
-        suitable_rooms = {
-            room_id
-            for room_id, room in self.rooms.items()
-            if (room.room_type == requirements.room_type and
-                room.capacity >= requirements.min_capacity and
-                (not requirements.requires_lab or room.features.get('lab')) and
-                (not requirements.requires_projector or room.features.get('projector')))
-        }
+        # Rooms of the right type with enough capacity
+        suitable_rooms = self.suitable_rooms(requirements.room_type,
+                                             requirements.min_capacity)
+        
+        # Feature checks only touch the remaining candidates
+        if requirements.requires_lab or requirements.requires_projector:
+            suitable_rooms = frozenset(
+                room_id for room_id in suitable_rooms
+                if ((not requirements.requires_lab or
+                     self.rooms[room_id].features.get('lab')) and
+                    (not requirements.requires_projector or
+                     self.rooms[room_id].features.get('projector')))
+            )
         
         # Get qualified instructors (this would typically use a qualification table)
-        qualified_instructors = set(self.instructors.keys())  # Simplified for now
+        qualified_instructors = frozenset(self.instructors)  # Simplified for now
         
         return (available_times, suitable_rooms, qualified_instructors)
     
+    def _room_index(self) -> Dict[str, List[Tuple[int, str]]]:
+        """Rooms grouped by type and sorted by capacity, rebuilt when rooms change"""
+        if self._indexed_rooms is not self.rooms or self._indexed_count != len(self.rooms):
+            index: Dict[str, List[Tuple[int, str]]] = {}
+            ids_by_type: Dict[str, Set[str]] = {}
+            for room_id, room in self.rooms.items():
+                ids_by_type.setdefault(room.room_type, set()).add(room_id)
+                if room.capacity is not None:
+                    index.setdefault(room.room_type, []).append((room.capacity, room_id))
+            for rooms in index.values():
+                rooms.sort()
+            self._rooms_by_type = index
+            self._room_ids_by_type = {
+                room_type: frozenset(ids) for room_type, ids in ids_by_type.items()
+            }
+            self._suitable_rooms = {}
+            self._indexed_rooms = self.rooms
+            self._indexed_count = len(self.rooms)
+        return self._rooms_by_type
+    
+    def suitable_rooms(self, room_type: str, min_capacity: int) -> FrozenSet[str]:
+        """IDs of rooms with the given type and at least min_capacity seats"""
+        by_capacity = self._room_index().get(room_type, [])
+        key = (room_type, min_capacity)
+        rooms = self._suitable_rooms.get(key)
+        if rooms is None:
+            start = bisect_left(by_capacity, (min_capacity, ''))
+            rooms = frozenset(room_id for _, room_id in by_capacity[start:])
+            self._suitable_rooms[key] = rooms
+        return rooms
+    
+    def teaching_instructors(self) -> FrozenSet[str]:
+        """IDs of instructors allowed any teaching hours, rebuilt when they change"""
+        if (self._teaching_from is not self.instructors or
+                self._teaching_count != len(self.instructors)):
+            self._teaching_instructors = frozenset(
+                instructor_id for instructor_id, instructor in self.instructors.items()
+                if instructor.max_hours_per_day > 0
+            )
+            self._teaching_from = self.instructors
+            self._teaching_count = len(self.instructors)
+        return self._teaching_instructors
+    
+    def rooms_of_type(self, room_type: str) -> FrozenSet[str]:
+        """IDs of all rooms with the given type"""
+        self._room_index()
+        return self._room_ids_by_type.get(room_type, frozenset())
+    
     def update_availability(self,
                           time_slot: TimeSlot,
                           room_id: Optional[str] = None,
                           instructor_id: Optional[str] = None) -> None:
         """Mark resources as unavailable for given time slot"""
         if room_id and room_id in self.rooms:
-            try:
-                self.rooms[room_id].available_times.remove(time_slot)
-            except ValueError:
-                pass
+            self.rooms[room_id].available_times.discard(time_slot)
+        
+        if instructor_id and instructor_id in self.instructors:
+            self.instructors[instructor_id].available_times.discard(time_slot)
             
     def restore_availability(self,
                              time_slot: TimeSlot,
@@ -118,9 +232,7 @@ class Domain:
                              instructor_id: Optional[str] = None) -> None:
         """Restore resource availability for given time slot"""
         if room_id and room_id in self.rooms:
-            if time_slot not in self.rooms[room_id].available_times:
-                self.rooms[room_id].available_times.append(time_slot)
+            self.rooms[room_id].available_times.add(time_slot)
 
         if instructor_id and instructor_id in self.instructors:
-            if time_slot not in self.instructors[instructor_id].available_times:
-                self.instructors[instructor_id].available_times.append(time_slot)
\ No newline at end of file
+            self.instructors[instructor_id].available_times.add(time_slot)
\ No newline at end of file
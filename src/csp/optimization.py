@@ -1,6 +1,11 @@
+from collections import defaultdict
 from dataclasses import dataclass
-from typing import List, Dict, Optional
-from .variable import Variable, TimeSlot
+from operator import itemgetter
+from typing import List, Dict, Optional, Tuple
+from .variable import Variable
+
+# Sort key for (day, start, end) tuples; leaves ties in insertion order
+_DAY_START = itemgetter(0, 1)
 
 @dataclass
 class OptimizationMetrics:
@@ -46,29 +51,23 @@ class SolutionOptimizer:
     def _calculate_gaps_score(self, variables: List[Variable]) -> float:
         """Calculate score based on gaps between classes"""
         gaps = 0.0
-        level_slots: Dict[int, List[TimeSlot]] = {}
+        # level -> [(day, start_minute, end_minute)]
+        level_slots: Dict[int, List[Tuple[str, int, int]]] = defaultdict(list)
         
         # Group time slots by level
         for var in variables:
             if not var.is_assigned or var._assigned_time is None:
                 continue
-            if var.level not in level_slots:
-                level_slots[var.level] = []
-            level_slots[var.level].append(var._assigned_time)  # Now we know it's not None
+            slot = var._assigned_time
+            level_slots[var.level].append((slot.day, slot.start_minute, slot.end_minute))
         
         # Calculate gaps for each level
         for level_times in level_slots.values():
-            sorted_times = sorted(level_times, 
-                               key=lambda x: (x.day, x.start_time))
+            level_times.sort(key=_DAY_START)
             
-            for i in range(len(sorted_times) - 1):
-                current = sorted_times[i]
-                next_slot = sorted_times[i + 1]
-                
-                if current.day == next_slot.day:
-                    # Calculate gap in minutes
-                    gap = (next_slot.start_time.hour * 60 + next_slot.start_time.minute) - \
-                          (current.end_time.hour * 60 + current.end_time.minute)
+            for (day, _, end), (next_day, next_start, _) in zip(level_times, level_times[1:]):
+                if day == next_day:
+                    gap = next_start - end
                     if gap > 0:
                         gaps += gap / 60  # Convert to hours
         
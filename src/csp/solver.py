@@ -1,5 +1,10 @@
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from typing import List, Optional, Dict, Set, Tuple
 from dataclasses import dataclass
+import multiprocessing
+import os
+import random
 import time
 from .variable import Variable, TimeSlot
 from .domain import Domain
@@ -15,133 +20,254 @@ class SolverStats:
     solutions_found: int
     best_score: float
 
+# Set in portfolio worker processes; tells a search to stop once a peer has won
+_stop_event = None
+
+def _init_portfolio_worker(stop_event) -> None:
+    global _stop_event
+    _stop_event = stop_event
+
+def _portfolio_search(constraint_manager: ConstraintManager,
+                      domain: Domain,
+                      variables: List[Variable],
+                      seed: Optional[int],
+                      max_solutions: int,
+                      timeout: float) -> Tuple[List[List[Variable]], SolverStats]:
+    """Run one portfolio member in a worker process"""
+    solver = Solver(constraint_manager, domain, seed=seed, stop_event=_stop_event)
+    solutions = solver.solve(variables, max_solutions, timeout)
+    return solutions, solver.stats
+
 class Solver:
     """CSP solver with optimization"""
     
+    # The timeout is checked once every DEADLINE_POLL_MASK + 1 value attempts;
+    # a single node can try thousands of values, so nodes are no bound
+    DEADLINE_POLL_MASK = 63
+    
     def __init__(self, 
                  constraint_manager: ConstraintManager,
                  domain: Domain,
-                 max_runtime: float = 300):
+                 max_runtime: float = 300,
+                 seed: Optional[int] = None,
+                 stop_event=None):
         self.constraint_manager = constraint_manager
         self.domain = domain
         self.stats = SolverStats(0, 0, 0, 0, float('inf'))
         self.optimizer = SolutionOptimizer(max_runtime)
         self.best_solution: Optional[List[Variable]] = None
         self.best_metrics: Optional[OptimizationMetrics] = None
+        # Last support found in var2 for each (var1, var2, value1) during ac3
+        self._supports: Dict[tuple, tuple] = {}
+        # Lone-variable score per time slot; independent of the partial assignment
+        self._value_scores: Dict[TimeSlot, float] = {}
+        # A seed shuffles value order among equal scores (portfolio diversity)
+        self._rng = random.Random(seed) if seed is not None else None
+        self.stop_event = stop_event
     
     def solve(self,
              variables: List[Variable],
              max_solutions: int = 1,
              timeout: float = 300) -> List[List[Variable]]:
         """Find optimized solutions"""
-        start_time = time.time()
-        solutions = []
+        start_time = time.monotonic()
+        deadline = start_time + timeout
+        timed_out = False
+        # Improved assignments as (time, room, instructor) per variable;
+        # Variable objects are only built for them once the search ends
+        snapshots: List[Tuple[tuple, ...]] = []
+        # Memoized scores must not outlive changes to the domain between runs
+        self._value_scores.clear()
+        
+        # Search order: order[:index] is assigned, the rest is picked by MRV
+        order = list(variables)
+        degree = self._level_degrees(variables)
         
         def backtrack(index: int) -> bool:
-            if time.time() - start_time > timeout:
+            nonlocal timed_out
+            if timed_out:
                 return False
                 
-            if index == len(variables):
+            if index == len(order):
                 # Score current solution
                 metrics = self.optimizer.score_solution(variables)
                 
                 if (not self.best_metrics or 
                     metrics.total_score > self.best_metrics.total_score):
                     self.best_metrics = metrics
-                    self.best_solution = [v.clone() for v in variables]
-                    solutions.append(self.best_solution)
+                    snapshots.append(tuple(
+                        (v._assigned_time, v._assigned_room, v._assigned_instructor)
+                        for v in variables
+                    ))
                     
                     # Early termination if solution is good enough
-                    if (len(solutions) >= max_solutions and 
+                    if (len(snapshots) >= max_solutions and 
                         metrics.total_score > self.optimizer.best_score):
                         return True
                 
-                return len(solutions) < max_solutions
+                return len(snapshots) < max_solutions
+            
+            # MRV: fewest remaining values first, most constrained on ties
+            best = min(range(index, len(order)),
+                       key=lambda k: (order[k].domain_size(), -degree[id(order[k])]))
+            order[index], order[best] = order[best], order[index]
+            variable = order[index]
             
             # Order values by potential impact on optimization
-            ordered_values = self._order_values(variables[index])
+            ordered_values = self._order_values(variable)
+            # Domains are immutable, so this trail frame is just references
+            trail = self._save_domains(order[index + 1:])
             
             for t, r, i in ordered_values:
                 self.stats.assignments += 1
+                # Reading the clock on every attempt is measurable; poll periodically
+                if timed_out or (self.stats.assignments & self.DEADLINE_POLL_MASK == 0 and
+                                 (time.monotonic() > deadline or
+                                  (self.stop_event is not None and self.stop_event.is_set()))):
+                    timed_out = True
+                    break
                 
                 # Try assignment
-                variables[index].assign(t, r, i)  # Fixed: use variables[index] instead of variable
+                variable.assign(t, r, i)
                 
                 # Check constraints
-                violations = self.constraint_manager.check_assignment(
-                    variables[:index + 1]
-                )
-                if not violations:
+                if not self.constraint_manager.check_assignment(order[:index + 1]):
                     # Forward checking
-                    if self._forward_check(variables[index + 1:]):
+                    if self._forward_check(order[index + 1:], variable):
                         if backtrack(index + 1):
                             return True
                 
                 # Backtrack
                 self.stats.backtracks += 1
-                variables[index].unassign()  # Fixed: use variables[index]
-                self._restore_domains(variables[index + 1:])
+                variable.unassign()
+                self._restore_domains(trail)
             
             return False
         
+        # Forward checking prunes in place; hand the domains back untouched
+        initial_domains = self._save_domains(variables)
         backtrack(0)
-        self.stats.runtime = time.time() - start_time
+        self._restore_domains(initial_domains)
+        
+        solutions = [self._materialize(variables, snapshot) for snapshot in snapshots]
+        if solutions:
+            self.best_solution = solutions[-1]
+        self.stats.runtime = time.monotonic() - start_time
         return solutions
     
-    def _forward_check(self, future_variables: List[Variable]) -> bool:
-        """Apply forward checking to future variables"""
+    def solve_portfolio(self,
+                        variables: List[Variable],
+                        workers: Optional[int] = None,
+                        max_solutions: int = 1,
+                        timeout: float = 300) -> List[List[Variable]]:
+        """Race differently seeded searches in worker processes; first
+        member to find solutions wins and the others are told to stop"""
+        workers = workers or os.cpu_count() or 1
+        start_time = time.monotonic()
+        stop_event = multiprocessing.Event()
+        solutions: List[List[Variable]] = []
+        
+        with ProcessPoolExecutor(max_workers=workers,
+                                 initializer=_init_portfolio_worker,
+                                 initargs=(stop_event,)) as executor:
+            # Member 0 keeps the plain sequential ordering
+            futures = [
+                executor.submit(_portfolio_search, self.constraint_manager,
+                                self.domain, variables, seed or None,
+                                max_solutions, timeout)
+                for seed in range(workers)
+            ]
+            for future in as_completed(futures):
+                found, stats = future.result()
+                if found:
+                    solutions, self.stats = found, stats
+                    stop_event.set()
+                    break
+        
+        if solutions:
+            self.best_solution = solutions[-1]
+            self.best_metrics = self.optimizer.score_solution(self.best_solution)
+        self.stats.runtime = time.monotonic() - start_time
+        return solutions
+    
+    def _forward_check(self,
+                       future_variables: List[Variable],
+                       assigned: Optional[Variable] = None) -> bool:
+        """Prune future domains against the just-assigned variable and fail
+        as soon as one of them is wiped out"""
+        slot = assigned._assigned_time if assigned is not None else None
+        
         for variable in future_variables:
             times, rooms, instructors = variable.get_domain()
             
-            # Check if any values remain after constraint propagation
+            # Overlapping times are ruled out when the clash is unavoidable:
+            # same level, or the only room/instructor left is the one taken
+            if slot is not None and (
+                    variable.level == assigned.level or
+                    (len(rooms) == 1 and assigned._assigned_room in rooms) or
+                    (len(instructors) == 1 and assigned._assigned_instructor in instructors)):
+                clashing = {t for t in times
+                            if t.day == slot.day and
+                            t.start_minute < slot.end_minute and
+                            slot.start_minute < t.end_minute}
+                if clashing:
+                    variable.reduce_domain(time_slots=clashing)
+                    times = variable.get_domain()[0]
+            
+            # Initial domains are already filtered by room type and capacity,
+            # so an empty domain is the only remaining way to fail
             if not (times and rooms and instructors):
                 return False
-                
-            # Try to find at least one valid assignment
-            valid_assignment = False
-            for t in times:
-                for r in rooms:
-                    for i in instructors:
-                        variable.assign(t, r, i)
-                        if not self.constraint_manager.check_assignment([variable]):
-                            valid_assignment = True
-                            variable.unassign()
-                            break
-                    if valid_assignment:
-                        break
-                if valid_assignment:
-                    break
-                    
-            variable.unassign()
-            if not valid_assignment:
-                return False
         
         return True
     
-    def _restore_domains(self, variables: List[Variable]) -> None:
-        """Restore original domains after backtracking"""
+    @staticmethod
+    def _materialize(variables: List[Variable],
+                     snapshot: Tuple[tuple, ...]) -> List[Variable]:
+        """Build the solution variables recorded in a snapshot"""
+        solution = []
+        for variable, (t, r, i) in zip(variables, snapshot):
+            assigned = variable.clone()
+            assigned.assign(t, r, i)
+            solution.append(assigned)
+        return solution
+    
+    @staticmethod
+    def _level_degrees(variables: List[Variable]) -> Dict[int, int]:
+        """Number of other variables each variable shares a level with"""
+        level_sizes: Dict[int, int] = {}
         for variable in variables:
-            # Reset to full domain from Domain object
-            times, rooms, instructors = self.domain.get_available_values(
-                variable.requirements
-            )
+            level_sizes[variable.level] = level_sizes.get(variable.level, 0) + 1
+        return {id(v): level_sizes[v.level] - 1 for v in variables}
+    
+    def _save_domains(self, variables: List[Variable]) -> List[Tuple[Variable, tuple]]:
+        """Record the current domains of variables for a later restore"""
+        return [(variable, variable.get_domain()) for variable in variables]
+    
+    def _restore_domains(self, trail: List[Tuple[Variable, tuple]]) -> None:
+        """Restore the domains recorded by _save_domains after backtracking"""
+        for variable, (times, rooms, instructors) in trail:
             variable.set_domain(times, rooms, instructors)
     
     def ac3(self, variables: List[Variable]) -> bool:
         """Apply AC-3 arc consistency algorithm"""
-        arcs = [(i, j) for i in range(len(variables)) 
-                      for j in range(len(variables)) if i != j]
+        self._supports.clear()
+        arcs = deque((i, j) for i in range(len(variables)) 
+                     for j in range(len(variables)) if i != j)
+        queued = set(arcs)  # each arc is in the worklist at most once
         
         while arcs:
-            i, j = arcs.pop(0)
+            i, j = arcs.popleft()
+            queued.discard((i, j))
             if self._revise(variables[i], variables[j]):
                 if variables[i].domain_size() == 0:
                     return False
                     
                 # Add neighboring arcs
                 for k in range(len(variables)):
-                    if k != i and k != j:
+                    if k != i and k != j and (k, i) not in queued:
                         arcs.append((k, i))
+                        queued.add((k, i))
         return True
     
     def _revise(self, var1: Variable, var2: Variable) -> bool:
@@ -157,6 +283,14 @@ class Solver:
                     compatible = False
                     times2, rooms2, instructors2 = var2.get_domain()
                     
+                    # Compatibility never changes, so a previously found
+                    # support that is still in var2's domain settles it
+                    key = (id(var1), id(var2), t1, r1, i1)
+                    support = self._supports.get(key)
+                    if (support is not None and support[0] in times2 and
+                            support[1] in rooms2 and support[2] in instructors2):
+                        continue
+                    
                     for t2 in times2:
                         for r2 in rooms2:
                             for i2 in instructors2:
@@ -165,6 +299,7 @@ class Solver:
                                 
                                 if not self.constraint_manager.check_assignment([var1, var2]):
                                     compatible = True
+                                    self._supports[key] = (t2, r2, i2)
                                     break
                             if compatible:
                                 break
@@ -175,13 +310,9 @@ class Solver:
                     var2.unassign()
                     
                     if not compatible:
-                        # Remove incompatible value
-                        if t1 in times1:
-                            times1.remove(t1)
-                        if r1 in rooms1:
-                            rooms1.remove(r1)
-                        if i1 in instructors1:
-                            instructors1.remove(i1)
+                        # Remove incompatible value (domains are immutable)
+                        var1.reduce_domain({t1}, {r1}, {i1})
+                        times1, rooms1, instructors1 = var1.get_domain()
                         revised = True
         
         return revised
@@ -189,17 +320,26 @@ class Solver:
     def _order_values(self, variable: Variable) -> List[tuple]:
         """Order domain values by potential optimization impact"""
         times, rooms, instructors = variable.get_domain()
-        values = []
+        if not (times and rooms and instructors):
+            return []
+        
+        # A lone variable's score only reads its time slot, so score each
+        # time once per solve rather than every (time, room, instructor)
+        scores = self._value_scores
+        missing = [t for t in times if t not in scores]
+        if missing:
+            room, instructor = next(iter(rooms)), next(iter(instructors))
+            for t in missing:
+                variable.assign(t, room, instructor)
+                scores[t] = self.optimizer.score_solution([variable]).total_score
+            variable.unassign()
         
-        for t in times:
-            for r in rooms:
-                for i in instructors:
-                    # Calculate preliminary score
-                    variable.assign(t, r, i)
-                    score = self.optimizer.score_solution([variable]).total_score
-                    variable.unassign()
-                    values.append((score, (t, r, i)))
+        times, rooms, instructors = list(times), list(rooms), list(instructors)
+        if self._rng is not None:
+            self._rng.shuffle(times)
+            self._rng.shuffle(rooms)
+            self._rng.shuffle(instructors)
         
-        # Sort by score in descending order
-        values.sort(reverse=True)
-        return [v[1] for v in values]
\ No newline at end of file
+        # Sort by score in descending order (stable, so ties keep domain order)
+        ordered_times = sorted(times, key=scores.__getitem__, reverse=True)
+        return [(t, r, i) for t in ordered_times for r in rooms for i in instructors]
\ No newline at end of file
@@ -1,6 +1,7 @@
-from typing import List, Set, Dict
+from collections import defaultdict
+from typing import List, Set, Dict, Tuple
 from .constraints import Constraint, ConstraintViolation
-from .variable import Variable, TimeSlot
+from .variable import Variable
 from .domain import Domain
 
 class ResourceConflictConstraint(Constraint):
@@ -8,38 +9,45 @@ class ResourceConflictConstraint(Constraint):
     
     def check(self, variables: List[Variable], domain: Domain) -> List[ConstraintViolation]:
         violations = []
-        resource_usage: Dict[str, Dict[TimeSlot, Variable]] = {
-            'rooms': {},
-            'instructors': {}
+        # Bookings per (resource id, day); only these can clash with each other
+        # (start minute, end minute, variable), so the scan compares plain ints
+        resource_usage: Dict[str, Dict[Tuple[str, str], List[Tuple[int, int, Variable]]]] = {
+            'rooms': defaultdict(list),
+            'instructors': defaultdict(list)
         }
         
         for var in variables:
             if not var.is_assigned or var._assigned_time is None:
                 continue
+            slot = var._assigned_time
+            start, end = slot.start_minute, slot.end_minute
+            entry = (start, end, var)
                 
             # Check room conflicts
             if var._assigned_room:
-                for slot, other_var in resource_usage['rooms'].items():
-                    if slot.overlaps(var._assigned_time) and other_var._assigned_room == var._assigned_room:
+                booked = resource_usage['rooms'][(var._assigned_room, slot.day)]
+                for other_start, other_end, other_var in booked:
+                    if start < other_end and other_start < end:
                         violations.append(ConstraintViolation(
                             constraint_type="room_conflict",
                             description=f"Room {var._assigned_room} double-booked",
                             variables=[var, other_var],
                             severity=1.0
                         ))
-                resource_usage['rooms'][var._assigned_time] = var
+                booked.append(entry)
             
             # Check instructor conflicts
             if var._assigned_instructor:
-                for slot, other_var in resource_usage['instructors'].items():
-                    if slot.overlaps(var._assigned_time) and other_var._assigned_instructor == var._assigned_instructor:
+                booked = resource_usage['instructors'][(var._assigned_instructor, slot.day)]
+                for other_start, other_end, other_var in booked:
+                    if start < other_end and other_start < end:
                         violations.append(ConstraintViolation(
                             constraint_type="instructor_conflict",
                             description=f"Instructor {var._assigned_instructor} double-booked",
                             variables=[var, other_var],
                             severity=1.0
                         ))
-                resource_usage['instructors'][var._assigned_time] = var
+                booked.append(entry)
                 
         return violations
     
@@ -61,24 +69,25 @@ class TimeConflictConstraint(Constraint):
     
     def check(self, variables: List[Variable], domain: Domain) -> List[ConstraintViolation]:
         violations = []
-        level_slots: Dict[int, Dict[TimeSlot, Variable]] = {}
+        # Earlier variables per (level, day); only these can clash
+        level_slots: Dict[Tuple[int, str], List[Tuple[int, int, Variable]]] = defaultdict(list)
         
         for var in variables:
             if not var.is_assigned or var._assigned_time is None:
                 continue
-                
-            if var.level not in level_slots:
-                level_slots[var.level] = {}
-                
-            for slot, other_var in level_slots[var.level].items():
-                if slot.overlaps(var._assigned_time):
+            slot = var._assigned_time
+            start, end = slot.start_minute, slot.end_minute
+            
+            scheduled = level_slots[(var.level, slot.day)]
+            for other_start, other_end, other_var in scheduled:
+                if start < other_end and other_start < end:
                     violations.append(ConstraintViolation(
                         constraint_type="time_conflict",
                         description=f"Time conflict in level {var.level}",
                         variables=[var, other_var],
                         severity=1.0
                     ))
-            level_slots[var.level][var._assigned_time] = var
+            scheduled.append((start, end, var))
             
         return violations
     
@@ -92,27 +101,20 @@ class LevelRequirementConstraint(Constraint):
     
     def check(self, variables: List[Variable], domain: Domain) -> List[ConstraintViolation]:
         violations = []
-        level_hours: Dict[int, Dict[str, float]] = {}  # level -> day -> hours
+        max_minutes = self.MAX_DAILY_HOURS * 60
+        # (level, day) -> scheduled minutes, summed as ints from TimeSlot minutes
+        level_minutes: Dict[Tuple[int, str], int] = defaultdict(int)
         
         for var in variables:
             if not var.is_assigned or var._assigned_time is None:  # Add None check
                 continue
                 
-            if var.level not in level_hours:
-                level_hours[var.level] = {}
-                
-            day = var._assigned_time.day
-            if day not in level_hours[var.level]:
-                level_hours[var.level][day] = 0
-                
-            # Calculate hours for this slot
-            start = var._assigned_time.start_time
-            end = var._assigned_time.end_time
-            hours = (end.hour - start.hour) + (end.minute - start.minute) / 60
-            
-            level_hours[var.level][day] += hours
+            slot = var._assigned_time
+            day = slot.day
+            key = (var.level, day)
+            level_minutes[key] += slot.end_minute - slot.start_minute
             
-            if level_hours[var.level][day] > self.MAX_DAILY_HOURS:
+            if level_minutes[key] > max_minutes:
                 violations.append(ConstraintViolation(
                     constraint_type="max_hours_exceeded",
                     description=f"Level {var.level} exceeds {self.MAX_DAILY_HOURS} hours on {day}",
@@ -1,13 +1,22 @@
-from dataclasses import dataclass
-from typing import Optional, Set
+from dataclasses import dataclass, field
+from typing import FrozenSet, Optional, Set
 from datetime import time
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class TimeSlot:
-    """Represents a time period in the schedule"""
+    """Represents a time period in the schedule (immutable, usable in sets)"""
     day: str
     start_time: time
     end_time: time
+    # Minutes since midnight, derived once so sorting and gap maths use ints
+    start_minute: int = field(init=False, compare=False, repr=False)
+    end_minute: int = field(init=False, compare=False, repr=False)
+    
+    def __post_init__(self):
+        object.__setattr__(self, 'start_minute',
+                           self.start_time.hour * 60 + self.start_time.minute)
+        object.__setattr__(self, 'end_minute',
+                           self.end_time.hour * 60 + self.end_time.minute)
     
     def overlaps(self, other: 'TimeSlot') -> bool:
         """Check if this time slot overlaps with another"""
@@ -15,7 +24,7 @@ class TimeSlot:
                 self.start_time < other.end_time and
                 other.start_time < self.end_time)
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ResourceRequirements:
     """Defines required resources for a course"""
     room_type: str
@@ -26,6 +35,11 @@ class ResourceRequirements:
 class Variable:
     """Represents a schedulable unit in the timetable CSP"""
     
+    # The solver creates and clones many of these; slots skip the per-instance dict
+    __slots__ = ('course_id', 'level', 'requirements',
+                 '_assigned_time', '_assigned_room', '_assigned_instructor',
+                 '_possible_times', '_possible_rooms', '_possible_instructors')
+    
     def __init__(self, 
                  course_id: str,
                  level: int,
@@ -36,18 +50,17 @@ class Variable:
         self._assigned_time: Optional[TimeSlot] = None
         self._assigned_room: Optional[str] = None
         self._assigned_instructor: Optional[str] = None
-        self._possible_times: Set[TimeSlot] = set()
-        self._possible_rooms: Set[str] = set()
-        self._possible_instructors: Set[str] = set()
+        # Domains are immutable: reductions rebind, so clones can share them
+        self._possible_times: FrozenSet[TimeSlot] = frozenset()
+        self._possible_rooms: FrozenSet[str] = frozenset()
+        self._possible_instructors: FrozenSet[str] = frozenset()
     
     @property
     def is_assigned(self) -> bool:
         """Check if variable has complete assignment"""
-        return all([
-            self._assigned_time,
-            self._assigned_room,
-            self._assigned_instructor
-        ])
+        return bool(self._assigned_time and
+                    self._assigned_room and
+                    self._assigned_instructor)
     
     def assign(self,
                time_slot: TimeSlot,
@@ -69,11 +82,12 @@ class Variable:
                   rooms: Set[str],
                   instructors: Set[str]) -> None:
         """Set possible values for this variable"""
-        self._possible_times = time_slots
-        self._possible_rooms = rooms
-        self._possible_instructors = instructors
+        # frozenset() of a frozenset is free, so shared domains are not copied
+        self._possible_times = frozenset(time_slots)
+        self._possible_rooms = frozenset(rooms)
+        self._possible_instructors = frozenset(instructors)
     
-    def get_domain(self) -> tuple[Set[TimeSlot], Set[str], Set[str]]:
+    def get_domain(self) -> tuple[FrozenSet[TimeSlot], FrozenSet[str], FrozenSet[str]]:
         """Get current domain values"""
         return (
             self._possible_times,
@@ -123,9 +137,9 @@ class Variable:
         new_var._assigned_room = self._assigned_room
         new_var._assigned_instructor = self._assigned_instructor
         
-        # Copy domain sets
-        new_var._possible_times = self._possible_times.copy()
-        new_var._possible_rooms = self._possible_rooms.copy()
-        new_var._possible_instructors = self._possible_instructors.copy()
+        # Domains are immutable, so the clone can share them
+        new_var._possible_times = self._possible_times
+        new_var._possible_rooms = self._possible_rooms
+        new_var._possible_instructors = self._possible_instructors
         
         return new_var
\ No newline at end of file
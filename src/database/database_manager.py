@@ -1,6 +1,9 @@
 from typing import List, Dict, Any, Optional, Tuple, Union
 import sqlite3
+import threading
+from functools import lru_cache
 from contextlib import contextmanager
+from pathlib import Path
 from dataclasses import dataclass
 from .query_optimizer import QueryOptimizer, QueryStats  # Added QueryStats import
 
@@ -12,25 +15,116 @@ class QueryResult:
     error: Optional[str] = None
     rows_affected: int = 0
 
+# SQL text per (table, columns) shape; identical strings also hit the
+# connection's own prepared-statement cache
+@lru_cache(maxsize=256)
+def _insert_sql(table: str, columns: Tuple[str, ...], skip_duplicates: bool) -> str:
+    placeholders = ', '.join(['?' for _ in columns])
+    query = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})"
+    if skip_duplicates:
+        query += " ON CONFLICT DO NOTHING"
+    return query
+
+def _where_clause(columns: Tuple[str, ...]) -> str:
+    return ' AND '.join([f"{k} = ?" for k in columns])
+
+@lru_cache(maxsize=256)
+def _select_sql(table: str, columns: Tuple[str, ...]) -> str:
+    query = f"SELECT * FROM {table}"
+    if columns:
+        query += f" WHERE {_where_clause(columns)}"
+    return query
+
+@lru_cache(maxsize=256)
+def _update_sql(table: str, set_columns: Tuple[str, ...], where_columns: Tuple[str, ...]) -> str:
+    set_clause = ', '.join([f"{k} = ?" for k in set_columns])
+    return f"UPDATE {table} SET {set_clause} WHERE {_where_clause(where_columns)}"
+
+@lru_cache(maxsize=256)
+def _delete_sql(table: str, where_columns: Tuple[str, ...]) -> str:
+    return f"DELETE FROM {table} WHERE {_where_clause(where_columns)}"
+
 class DatabaseManager:
     """Manages database operations with optimization support"""
     
+    # Applied once per connection when it is opened
+    PRAGMAS = [
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        "PRAGMA temp_store=MEMORY",
+        "PRAGMA mmap_size=268435456",
+        "PRAGMA cache_size=-65536"  # 64 MiB page cache (negative = KiB)
+    ]
+    
+    # Prepared statements kept per connection (sqlite3 defaults to 128); the
+    # CRUD helpers reuse identical SQL text per table/column shape
+    CACHED_STATEMENTS = 256
+    
+    # Read-only connections cannot change the journal or sync mode
+    READ_PRAGMAS = [
+        "PRAGMA query_only=1",
+        "PRAGMA temp_store=MEMORY",
+        "PRAGMA mmap_size=268435456",
+        "PRAGMA cache_size=-65536"
+    ]
+    
     def __init__(self, db_path: str):
         self.db_path = db_path
         self.optimizer = QueryOptimizer(db_path)
+        self._local = threading.local()
+    
+    def _get_connection(self) -> sqlite3.Connection:
+        """Return this thread's persistent connection, opening it on first use"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path,
+                                   cached_statements=self.CACHED_STATEMENTS)
+            # Rows index by position or column name without building dicts
+            conn.row_factory = sqlite3.Row
+            for pragma in self.PRAGMAS:
+                conn.execute(pragma)
+            self._local.conn = conn
+        return conn
+    
+    def _get_read_connection(self) -> sqlite3.Connection:
+        """Return this thread's read-only connection, opening it on first use.
+
+        Under WAL it reads committed data without waiting on writers. The
+        writer is opened first so the file exists with its WAL index.
+        """
+        conn = getattr(self._local, 'read_conn', None)
+        if conn is None:
+            if self.db_path == ':memory:':
+                return self._get_connection()
+            self._get_connection()
+            uri = Path(self.db_path).resolve().as_uri() + '?mode=ro'
+            conn = sqlite3.connect(uri, uri=True,
+                                   cached_statements=self.CACHED_STATEMENTS)
+            conn.row_factory = sqlite3.Row
+            for pragma in self.READ_PRAGMAS:
+                conn.execute(pragma)
+            self._local.read_conn = conn
+        return conn
+    
+    def close(self) -> None:
+        """Close this thread's persistent connections"""
+        for name in ('read_conn', 'conn'):
+            conn = getattr(self._local, name, None)
+            if conn is not None:
+                conn.close()
+                setattr(self._local, name, None)
+        self.optimizer.close()
     
     @contextmanager
     def connection(self):
         """Context manager for database connections"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._get_connection()
         try:
             yield conn
             conn.commit()
         except Exception as e:
             conn.rollback()
             raise e
-        finally:
-            conn.close()
 
     def execute_query(self, 
                      query: str, 
@@ -84,50 +178,68 @@ class DatabaseManager:
         try:
             with self.connection() as conn:
                 cur = conn.cursor()
+                if not conn.in_transaction:
+                    cur.execute("BEGIN")
                 results = []
                 
+                # One cursor and one commit; any error rolls back every query
                 for query, params in queries:
-                    # Always set analyze=False for transactions
-                    query_result = self.execute_query(query, params, analyze=False)
-                    
-                    # We know it's QueryResult since analyze=False
-                    if not isinstance(query_result, QueryResult):
-                        return QueryResult(False, error="Unexpected query result type")
-                    
-                    if not query_result.success:
-                        return query_result
-                    
-                    if query_result.data:
-                        results.append(query_result.data)
+                    cur.execute(query, params)
+                    if cur.description is not None:
+                        data = cur.fetchall()
+                        if data:
+                            results.append(data)
                 
                 return QueryResult(True, data=results)
                 
         except sqlite3.Error as e:
             return QueryResult(False, error=str(e))
 
-    def create_record(self, table: str, data: Dict[str, Any]) -> QueryResult:
-        """Insert a new record"""
-        columns = ', '.join(data.keys())
-        placeholders = ', '.join(['?' for _ in data])
-        query = f"INSERT INTO {table} ({columns}) VALUES ({placeholders})"
+    def create_record(self, 
+                     table: str, 
+                     data: Dict[str, Any], 
+                     skip_duplicates: bool = False
+                     ) -> QueryResult:
+        """Insert a new record; with skip_duplicates a unique-key clash
+        inserts nothing and reports rows_affected == 0"""
+        query = _insert_sql(table, tuple(data), skip_duplicates)
         result = self.execute_query(query, tuple(data.values()), fetch=False)
         return result if isinstance(result, QueryResult) else result[0]
 
+    def create_records(self, 
+                      table: str, 
+                      records: List[Dict[str, Any]],
+                      skip_duplicates: bool = False
+                      ) -> QueryResult:
+        """Insert many records with one executemany in a single transaction"""
+        if not records:
+            return QueryResult(True)
+        columns = tuple(records[0])
+        if any(record.keys() != records[0].keys() for record in records):
+            return QueryResult(False, error="All records must have the same columns")
+        query = _insert_sql(table, columns, skip_duplicates)
+        return self.execute_batch(
+            query, [tuple(record[c] for c in columns) for record in records]
+        )
+
     def read_records(self, 
                     table: str, 
                     conditions: Optional[Dict[str, Any]] = None
                     ) -> QueryResult:
         """Read records with optional conditions"""
-        query = f"SELECT * FROM {table}"
-        params = ()
+        conditions = conditions or {}
+        query = _select_sql(table, tuple(conditions))
+        params = tuple(conditions.values())
         
-        if conditions:
-            where_clause = ' AND '.join([f"{k} = ?" for k in conditions.keys()])
-            query += f" WHERE {where_clause}"
-            params = tuple(conditions.values())
-            
-        result = self.execute_query(query, params)
-        return result if isinstance(result, QueryResult) else result[0]
+        # Pure read: no transaction to commit, so skip connection(). Inside an
+        # open transaction read through the writer to see its own changes
+        try:
+            writer = self._get_connection()
+            conn = writer if writer.in_transaction else self._get_read_connection()
+            data = conn.execute(query, params).fetchall()
+            return QueryResult(True, data=data, rows_affected=len(data))
+        except sqlite3.Error as e:
+            return QueryResult(False, error=str(e))
 
     def update_record(self, 
                      table: str, 
@@ -135,10 +247,8 @@ class DatabaseManager:
                      conditions: Dict[str, Any]
                      ) -> QueryResult:
         """Update records matching conditions"""
-        set_clause = ', '.join([f"{k} = ?" for k in data.keys()])
-        where_clause = ' AND '.join([f"{k} = ?" for k in conditions.keys()])
-        query = f"UPDATE {table} SET {set_clause} WHERE {where_clause}"
-        params = tuple(list(data.values()) + list(conditions.values()))
+        query = _update_sql(table, tuple(data), tuple(conditions))
+        params = (*data.values(), *conditions.values())
         result = self.execute_query(query, params, fetch=False)
         return result if isinstance(result, QueryResult) else result[0]
 
@@ -147,7 +257,6 @@ class DatabaseManager:
                      conditions: Dict[str, Any]
                      ) -> QueryResult:
         """Delete records matching conditions"""
-        where_clause = ' AND '.join([f"{k} = ?" for k in conditions.keys()])
-        query = f"DELETE FROM {table} WHERE {where_clause}"
+        query = _delete_sql(table, tuple(conditions))
         result = self.execute_query(query, tuple(conditions.values()), fetch=False)
         return result if isinstance(result, QueryResult) else result[0]
\ No newline at end of file
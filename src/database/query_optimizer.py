@@ -1,8 +1,32 @@
 from typing import List, Dict, Optional, Tuple
 import sqlite3
+import threading
 import time
 from dataclasses import dataclass
 import logging
+from ..log_handlers import buffered_file_handler
+
+# The timetable index set. Each resource gets one composite index led by
+# its id, so per-resource lookups are range seeks. dbcreate builds the same
+# set after a load; tests/test_dbcreate.py keeps the two in step.
+TIMETABLE_INDICES = [
+    ('idx_timetable_course', 'timetable(course_id)'),
+    ('idx_timetable_day_time', 'timetable(day, start_time, end_time)'),
+    ('idx_timetable_room_day', 'timetable(room_id, day, start_time, end_time)'),
+    ('idx_timetable_instructor_day', 'timetable(instructor_id, day, start_time, end_time)'),
+    ('idx_timetable_level_day', 'timetable(level, day, start_time, end_time)')
+]
+# Superseded indices dropped from existing databases: single-column ones that
+# prefix the composites, and earlier overlapping sets built by dbcreate and here
+OBSOLETE_INDICES = [
+    'idx_timetable_room', 'idx_timetable_instructor',
+    'idx_tt_instructor', 'idx_tt_day_start_room',
+    'idx_tt_room_cover', 'idx_tt_instructor_cover', 'idx_tt_level_cover',
+    'idx_timetable_room_cover', 'idx_timetable_instructor_cover', 'idx_timetable_level_cover'
+]
+# PRAGMA user_version once the set above is in place, so the migration and
+# its schema lock only happen on the first open of each database
+INDEX_VERSION = 1
 
 @dataclass
 class QueryStats:
@@ -19,45 +43,63 @@ class QueryOptimizer:
     def __init__(self, db_path: str):
         self.db_path = db_path
         self.logger = logging.getLogger(__name__)
+        self._local = threading.local()
         self._setup_logging()
         self._create_indices()
 
+    def _get_connection(self) -> sqlite3.Connection:
+        """Return this thread's persistent connection, opening it on first use"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path)
+            self._local.conn = conn
+        return conn
+
+    def close(self) -> None:
+        """Close this thread's persistent connection"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
     def _setup_logging(self):
         """Configure performance logging"""
-        handler = logging.FileHandler('query_performance.log')
-        formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        )
-        handler.setFormatter(formatter)
-        self.logger.addHandler(handler)
+        handler = buffered_file_handler('query_performance.log')
+        if handler not in self.logger.handlers:
+            self.logger.addHandler(handler)
         self.logger.setLevel(logging.INFO)
+        self.logger.propagate = False
 
     def _create_indices(self):
-        """Create necessary indices for common queries"""
-        indices = [
-            ('idx_timetable_course', 'timetable(course_id)'),
-            ('idx_timetable_room', 'timetable(room_id)'),
-            ('idx_timetable_instructor', 'timetable(instructor_id)'),
-            ('idx_timetable_day_time', 'timetable(day, start_time, end_time)')
-        ]
-        
-        with sqlite3.connect(self.db_path) as conn:
+        """Create the timetable indices and drop the ones they supersede, once per database"""
+        with self._get_connection() as conn:
             cur = conn.cursor()
-            for index_name, index_cols in indices:
+            cur.execute("PRAGMA user_version")
+            if cur.fetchone()[0] >= INDEX_VERSION:
+                return
+            for index_name in OBSOLETE_INDICES:
+                cur.execute(f"DROP INDEX IF EXISTS {index_name}")
+            created = True
+            for index_name, index_cols in TIMETABLE_INDICES:
                 try:
                     cur.execute(f"CREATE INDEX IF NOT EXISTS {index_name} ON {index_cols}")
                 except sqlite3.Error as e:
+                    created = False
                     self.logger.error(f"Failed to create index {index_name}: {e}")
+            # Retried on the next open until the timetable supports every index
+            if created:
+                cur.execute(f"PRAGMA user_version = {INDEX_VERSION}")
 
     def analyze_query(self, query: str, params: Tuple = ()) -> QueryStats:
         """Analyze query execution plan and performance"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._get_connection() as conn:
             cur = conn.cursor()
             
-            # Get execution plan
-            cur.execute(f"EXPLAIN QUERY PLAN {query}", params)
-            plan = [dict(zip(['id', 'parent', 'notused', 'detail'], row)) 
-                   for row in cur.fetchall()]
+            # Get execution plan; rows are addressed by column name
+            cur.row_factory = sqlite3.Row
+            plan = [dict(row) for row in
+                    cur.execute(f"EXPLAIN QUERY PLAN {query}", params)]
+            cur.row_factory = None
             
             # Check index usage
             uses_index = any('USING INDEX' in row['detail'] 
@@ -90,9 +132,11 @@ class QueryOptimizer:
 
     def _log_performance(self, stats: QueryStats):
         """Log query performance statistics"""
+        # %-style args are only formatted when the buffered record is flushed
         self.logger.info(
-            f"Query: {stats.query[:100]}... "
-            f"Time: {stats.execution_time:.4f}s "
-            f"Rows: {stats.rows_affected} "
-            f"Index: {stats.uses_index}"
+            "Query: %s... Time: %.4fs Rows: %d Index: %s",
+            stats.query[:100],
+            stats.execution_time,
+            stats.rows_affected,
+            stats.uses_index
         )
\ No newline at end of file
@@ -1,5 +1,6 @@
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
+import os
 import sqlite3
 
 @dataclass
@@ -9,6 +10,10 @@ class ValidationResult:
     errors: List[str]
     warnings: List[str]
 
+def _copy_result(result: ValidationResult) -> ValidationResult:
+    """Copy with its own lists, so callers cannot alter a cached result"""
+    return ValidationResult(result.is_valid, list(result.errors), list(result.warnings))
+
 class SchemaValidator:
     """Validates database schema and data integrity"""
     
@@ -43,6 +48,8 @@ class SchemaValidator:
 
     def __init__(self, db_path: str):
         self.db_path = db_path
+        # ((file inode, schema_version), result) of the last full validation
+        self._cached: Optional[Tuple[Tuple[int, ...], ValidationResult]] = None
 
     def validate_schema(self) -> ValidationResult:
         """Validate database schema against expected structure"""
@@ -53,9 +60,19 @@ class SchemaValidator:
             with sqlite3.connect(self.db_path) as conn:
                 cur = conn.cursor()
                 
-                # Get existing tables
-                cur.execute("SELECT name FROM sqlite_master WHERE type='table'")
-                existing_tables = {row[0] for row in cur.fetchall()}
+                key = self._schema_key(cur)
+                if key is not None and self._cached is not None and self._cached[0] == key:
+                    return _copy_result(self._cached[1])
+                
+                # Every table's columns in one round-trip
+                cur.execute("""
+                    SELECT m.name, p.name, p.type
+                    FROM sqlite_master m, pragma_table_info(m.name) p
+                    WHERE m.type = 'table'
+                """)
+                existing_tables: Dict[str, Dict[str, str]] = {}
+                for table, col, type_ in cur.fetchall():
+                    existing_tables.setdefault(table, {})[col] = type_
                 
                 # Check for missing tables
                 for table in self.EXPECTED_TABLES:
@@ -64,8 +81,7 @@ class SchemaValidator:
                         continue
                     
                     # Check table schema
-                    cur.execute(f"PRAGMA table_info({table})")
-                    columns = {row[1]: row[2] for row in cur.fetchall()}
+                    columns = existing_tables[table]
                     
                     for col, type_ in self.EXPECTED_TABLES[table].items():
                         if col not in columns:
@@ -78,11 +94,14 @@ class SchemaValidator:
                                 f"expected {type_}"
                             )
                 
-                return ValidationResult(
+                result = ValidationResult(
                     is_valid=len(errors) == 0,
                     errors=errors,
                     warnings=warnings
                 )
+                if key is not None:
+                    self._cached = (key, _copy_result(result))
+                return result
                 
         except sqlite3.Error as e:
             return ValidationResult(
@@ -91,6 +110,21 @@ class SchemaValidator:
                 warnings=[]
             )
 
+    def _schema_key(self, cur: sqlite3.Cursor) -> Optional[Tuple[int, ...]]:
+        """(device, inode, mtime, schema_version), or None when there is no
+        file to stat (e.g. ':memory:'), in which case nothing is cached
+
+        schema_version only changes on DDL. A file recreated at the same path
+        can reuse the inode and start from the same low schema_version, so
+        the device and modification time are part of the key too.
+        """
+        try:
+            stat = os.stat(self.db_path)
+        except OSError:
+            return None
+        cur.execute("PRAGMA schema_version")
+        return (stat.st_dev, stat.st_ino, stat.st_mtime_ns, cur.fetchone()[0])
+
 class RelationshipValidator:
     """Validates referential integrity and relationships"""
     
@@ -107,15 +141,7 @@ class RelationshipValidator:
                 cur = conn.cursor()
                 
                 # Check timetable foreign keys
-                self._check_foreign_key(
-                    cur, 'timetable', 'room_id', 'rooms', errors
-                )
-                self._check_foreign_key(
-                    cur, 'timetable', 'course_id', 'courses', errors
-                )
-                self._check_foreign_key(
-                    cur, 'timetable', 'instructor_id', 'instructors', errors
-                )
+                self._check_foreign_keys(cur, errors)
                 
                 # Check for orphaned records
                 self._check_orphaned_records(cur, warnings)
@@ -133,44 +159,61 @@ class RelationshipValidator:
                 warnings=[]
             )
 
-    def _check_foreign_key(self, 
-                          cur: sqlite3.Cursor, 
-                          table: str, 
-                          fk_column: str, 
-                          ref_table: str, 
-                          errors: List[str]) -> None:
-        """Check foreign key references"""
-        cur.execute(f"""
-            SELECT DISTINCT t.{fk_column}
-            FROM {table} t
-            LEFT JOIN {ref_table} r ON t.{fk_column} = r.{fk_column}
-            WHERE t.{fk_column} IS NOT NULL
-            AND r.{fk_column} IS NULL
-        """)
-        invalid_refs = cur.fetchall()
-        if invalid_refs:
-            refs = ', '.join(str(ref[0]) for ref in invalid_refs)
-            errors.append(
-                f"Invalid {fk_column} references in {table}: {refs}"
-            )
+    def _check_foreign_keys(self, 
+                           cur: sqlite3.Cursor, 
+                           errors: List[str]) -> None:
+        """Check every timetable foreign key in one round-trip"""
+        cur.execute(FOREIGN_KEY_SQL)
+        invalid_refs: Dict[str, List[str]] = {}
+        for fk_column, ref in cur.fetchall():
+            invalid_refs.setdefault(fk_column, []).append(str(ref))
+        
+        for fk_column, _ in TIMETABLE_FOREIGN_KEYS:
+            if fk_column in invalid_refs:
+                refs = ', '.join(invalid_refs[fk_column])
+                errors.append(
+                    f"Invalid {fk_column} references in timetable: {refs}"
+                )
 
     def _check_orphaned_records(self, 
                               cur: sqlite3.Cursor, 
                               warnings: List[str]) -> None:
         """Check for unused records in reference tables"""
-        for ref_table, fk_col in [
-            ('rooms', 'room_id'),
-            ('courses', 'course_id'),
-            ('instructors', 'instructor_id')
-        ]:
-            cur.execute(f"""
-                SELECT COUNT(*)
-                FROM {ref_table} r
-                LEFT JOIN timetable t ON r.{fk_col} = t.{fk_col}
-                WHERE t.{fk_col} IS NULL
-            """)
-            count = cur.fetchone()[0]
+        cur.execute(ORPHANED_RECORDS_SQL)
+        for ref_table, count in cur.fetchall():
             if count > 0:
                 warnings.append(
                     f"Found {count} unused records in {ref_table}"
-                )
\ No newline at end of file
+                )
+
+# Timetable column -> table it references
+TIMETABLE_FOREIGN_KEYS = [
+    ('room_id', 'rooms'),
+    ('course_id', 'courses'),
+    ('instructor_id', 'instructors')
+]
+
+# Distinct dangling references per column; each branch is an anti-join
+# probing the referenced table's key, and UNION drops repeated values
+FOREIGN_KEY_SQL = "\nUNION\n".join(
+    f"""
+    SELECT '{fk_column}', t.{fk_column}
+    FROM timetable t
+    WHERE t.{fk_column} IS NOT NULL
+      AND NOT EXISTS (
+          SELECT 1 FROM {ref_table} r WHERE r.{fk_column} = t.{fk_column}
+      )"""
+    for fk_column, ref_table in TIMETABLE_FOREIGN_KEYS
+)
+
+# Unused rows per reference table, counted in one round-trip; NOT EXISTS
+# stops at the first timetable row using the key
+ORPHANED_RECORDS_SQL = "\nUNION ALL\n".join(
+    f"""
+    SELECT '{ref_table}', COUNT(*)
+    FROM {ref_table} r
+    WHERE NOT EXISTS (
+        SELECT 1 FROM timetable t WHERE t.{fk_column} = r.{fk_column}
+    )"""
+    for fk_column, ref_table in TIMETABLE_FOREIGN_KEYS
+)
@@ -1,9 +1,20 @@
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Set, Tuple
+from typing import Dict, List, Optional, Set
 from ..csp.variable import Variable, TimeSlot, ResourceRequirements
 from ..csp.domain import Domain
 from ..csp.optimization import OptimizationMetrics
 
+MINUTES_PER_DAY = 24 * 60
+
+# resource_id -> bitmask of booked minutes over the week; day d occupies bits
+# [d * MINUTES_PER_DAY, (d + 1) * MINUTES_PER_DAY)
+ResourceIndex = Dict[str, int]
+
+def _minute_mask(time_slot: TimeSlot) -> int:
+    """Bitmask with one bit set per minute covered by the time slot"""
+    length = max(time_slot.end_minute - time_slot.start_minute, 0)
+    return ((1 << length) - 1) << time_slot.start_minute
+
 @dataclass
 class SchedulingResult:
     """Result of scheduling attempt"""
@@ -17,10 +28,12 @@ class LevelScheduler:
     
     def __init__(self, domain: Domain):
         self.domain = domain
-        self.scheduled_resources: Dict[str, Set[Tuple[str, TimeSlot]]] = {
-            'rooms': set(),
-            'instructors': set()
+        self.scheduled_resources: Dict[str, ResourceIndex] = {
+            'rooms': {},
+            'instructors': {}
         }
+        # day name -> position of its block of bits in the masks
+        self._day_index: Dict[str, int] = {}
     
     def schedule_level(self, 
                       level: int, 
@@ -86,28 +99,42 @@ class LevelScheduler:
         )
         available_instructors = self._filter_available_instructors(instructors)
         
-        # Try each combination
+        # Rooms and instructors are booked independently, so per time slot
+        # the first free room and the first free instructor are the answer
+        room_busy = self.scheduled_resources['rooms']
+        instructor_busy = self.scheduled_resources['instructors']
         for time in available_times:
-            for room in available_rooms:
-                if self._is_resource_available('rooms', room, time):
-                    for instructor in available_instructors:
-                        if self._is_resource_available('instructors', instructor, time):
-                            # Try assignment
-                            variable.assign(time, room, instructor)
-                            
-                            # Update resource tracking
-                            self._mark_resource_used('rooms', room, time)
-                            self._mark_resource_used('instructors', instructor, time)
-                            
-                            return True
+            mask = self._week_mask(time)
+            room = next((r for r in available_rooms
+                         if not room_busy.get(r, 0) & mask), None)
+            if room is None:
+                continue
+            instructor = next((i for i in available_instructors
+                               if not instructor_busy.get(i, 0) & mask), None)
+            if instructor is None:
+                continue
+            
+            # Try assignment
+            variable.assign(time, room, instructor)
+            
+            # Update resource tracking
+            self._mark_resource_used('rooms', room, time)
+            self._mark_resource_used('instructors', instructor, time)
+            
+            return True
         
         return False
     
+    def _week_mask(self, time_slot: TimeSlot) -> int:
+        """Minute mask of the time slot shifted into its day's block"""
+        day = self._day_index.setdefault(time_slot.day, len(self._day_index))
+        return _minute_mask(time_slot) << (day * MINUTES_PER_DAY)
+    
     def _reset_resources(self):
         """Reset resource tracking"""
-        self.scheduled_resources: Dict[str, Set[Tuple[str, TimeSlot]]] =  {
-            'rooms': set(),
-            'instructors': set()
+        self.scheduled_resources: Dict[str, ResourceIndex] = {
+            'rooms': {},
+            'instructors': {}
         }
     
     def _get_level_conflicts(self, level: int) -> Set[TimeSlot]:
@@ -119,30 +146,26 @@ class LevelScheduler:
                               rooms: Set[str], 
                               requirements: 'ResourceRequirements') -> Set[str]:
         """Filter rooms based on requirements"""
-        return {
-            room for room in rooms
-            if self.domain.rooms[room].room_type == requirements.room_type
-            and self.domain.rooms[room].capacity >= requirements.min_capacity
-        }
+        return rooms & self.domain.suitable_rooms(requirements.room_type,
+                                                  requirements.min_capacity)
     
     def _filter_available_instructors(self, 
                                     instructors: Set[str]) -> Set[str]:
         """Filter instructors based on availability"""
-        return {
-            i for i in instructors
-            if self.domain.instructors[i].max_hours_per_day > 0
-        }
+        return instructors & self.domain.teaching_instructors()
     
     def _is_resource_available(self, 
                              resource_type: str,
                              resource_id: str,
                              time_slot: TimeSlot) -> bool:
-        """Check if a resource is available at given time"""
-        return (resource_id, time_slot) not in self.scheduled_resources[resource_type]
+        """Check if a resource is free for the whole of the given time slot"""
+        busy = self.scheduled_resources[resource_type].get(resource_id, 0)
+        return not busy & self._week_mask(time_slot)
     
     def _mark_resource_used(self,
                           resource_type: str,
                           resource_id: str,
                           time_slot: TimeSlot):
         """Mark a resource as used for a time slot"""
-        self.scheduled_resources[resource_type].add((resource_id, time_slot))
\ No newline at end of file
+        index = self.scheduled_resources[resource_type]
+        index[resource_id] = index.get(resource_id, 0) | self._week_mask(time_slot)
\ No newline at end of file
@@ -1,11 +1,13 @@
 from dataclasses import dataclass
 from typing import Dict, List, Optional
 import logging
+import sqlite3
 from ..csp.solver import Solver
 from ..csp.domain import Domain
 from ..csp.variable import Variable, ResourceRequirements
 from ..csp.constraints import ConstraintManager
 from ..parser.level_parser import LevelParser
+from ..log_handlers import buffered_file_handler
 from .scheduler import LevelScheduler
 
 @dataclass
@@ -22,6 +24,8 @@ class TimetableGenerator:
     def __init__(self, db_path: str, levels_path: str):
         self.db_path = db_path
         self.levels_path = levels_path
+        # Opened on first requirements lookup and reused for every course
+        self._conn: Optional[sqlite3.Connection] = None
         self.logger = logging.getLogger(__name__)
         self._setup_logging()
         
@@ -34,13 +38,11 @@ class TimetableGenerator:
     
     def _setup_logging(self):
         """Configure logging"""
-        handler = logging.FileHandler('generator.log')
-        formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        )
-        handler.setFormatter(formatter)
-        self.logger.addHandler(handler)
+        handler = buffered_file_handler('generator.log')
+        if handler not in self.logger.handlers:
+            self.logger.addHandler(handler)
         self.logger.setLevel(logging.INFO)
+        self.logger.propagate = False
     
     def generate(self, 
                 max_attempts: int = 3, 
@@ -120,12 +122,21 @@ class TimetableGenerator:
         
         return variables
     
+    def close(self) -> None:
+        """Close the connection used for course requirement lookups"""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+    
     def _get_course_requirements(self, 
                                course_id: str) -> Optional[ResourceRequirements]:
         """Get course requirements from database"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            if self._conn is None:
+                self._conn = sqlite3.connect(self.db_path)
+            with self._conn as conn:
                 cur = conn.cursor()
+                cur.row_factory = sqlite3.Row
                 cur.execute("""
                     SELECT course_type, min_capacity, requires_lab, requires_projector
                     FROM courses 
@@ -135,10 +146,10 @@ class TimetableGenerator:
                 
                 if row:
                     return ResourceRequirements(
-                        room_type=row[0],
-                        min_capacity=row[1],
-                        requires_lab=bool(row[2]),
-                        requires_projector=bool(row[3])
+                        room_type=row['course_type'],
+                        min_capacity=row['min_capacity'],
+                        requires_lab=bool(row['requires_lab']),
+                        requires_projector=bool(row['requires_projector'])
                     )
                 return None
                 
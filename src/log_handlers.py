@@ -0,0 +1,16 @@
+from functools import lru_cache
+import logging
+import logging.handlers
+
+@lru_cache(maxsize=None)
+def buffered_file_handler(filename: str) -> logging.Handler:
+    """Shared buffered handler per log file; the file is opened on first flush"""
+    file_handler = logging.FileHandler(filename, delay=True)
+    file_handler.setFormatter(logging.Formatter(
+        '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    ))
+    return logging.handlers.MemoryHandler(
+        capacity=1024,
+        flushLevel=logging.ERROR,
+        target=file_handler
+    )
@@ -21,6 +21,11 @@ class MissingCourseError(LevelParserError):
 
 class ConstraintViolationError(LevelParserError):
     """Raised when course constraints are violated"""
-    def __init__(self, constraint: str, details: str):
+    def __init__(self, 
+                 constraint: str, 
+                 details: str, 
+                 errors: Optional[List[str]] = None):
         self.constraint = constraint
+        # Individual messages, so callers never need to split the text
+        self.errors = errors if errors is not None else [details]
         super().__init__(f"Constraint violation ({constraint}): {details}")
\ No newline at end of file
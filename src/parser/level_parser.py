@@ -4,8 +4,13 @@ from json.decoder import JSONDecodeError
 from typing import Any, Dict, List, Union, Optional, Set
 from dataclasses import dataclass
 from enum import Enum
+import re
 import sqlite3
 
+# Course IDs look like CSC111, MTH212, etc.
+COURSE_ID_PATTERN = r'^[A-Z]{2,3}\d{3}$'
+COURSE_ID_RE = re.compile(COURSE_ID_PATTERN)
+
 class ValidationError(Exception):
     """Custom exception for validation errors"""
     pass
@@ -158,9 +163,7 @@ class LevelParser:
 
     def _is_valid_course_id(self, course_id: str) -> bool:
         """Validate course ID format"""
-        # Example: Matches format like CSC111, MTH212, etc.
-        import re
-        return bool(re.match(r'^[A-Z]{2,3}\d{3}$', course_id))
+        return COURSE_ID_RE.match(course_id) is not None
 
     def validate(self, raise_errors: bool = True) -> List[str]:
         """Run all validation with error handling"""
@@ -207,7 +210,7 @@ class LevelParser:
             errors.append(error)
             
         if errors and raise_errors:
-            raise ConstraintViolationError("validation", "; ".join(errors))
+            raise ConstraintViolationError("validation", "; ".join(errors), errors)
             
         return errors
     
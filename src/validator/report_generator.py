@@ -1,6 +1,8 @@
+from collections import defaultdict
 from dataclasses import dataclass
 from typing import Dict, List, Optional
 import json
+import os
 from datetime import datetime
 from ..csp.variable import Variable
 from .solution_validator import ValidationMetrics
@@ -23,7 +25,6 @@ class ReportGenerator:
     
     def _ensure_output_dir(self):
         """Create output directory if it doesn't exist"""
-        import os
         os.makedirs(self.output_dir, exist_ok=True)
     
     def generate_report(self,
@@ -70,7 +71,7 @@ class ReportGenerator:
                           violations: List[str]
                           ) -> List[Dict]:
         """Group and analyze constraint violations"""
-        violation_types = {}
+        violation_types: Dict[str, List[str]] = defaultdict(list)
         
         for violation in violations:
             # Extract violation type and details
@@ -81,8 +82,6 @@ class ReportGenerator:
             else:
                 type_ = "Other Violation"
                 
-            if type_ not in violation_types:
-                violation_types[type_] = []
             violation_types[type_].append(violation)
         
         return [
@@ -139,14 +138,16 @@ class ReportGenerator:
     
     def _save_json_report(self, report: ValidationReport, filepath: str):
         """Save report in JSON format"""
+        # Encode in one pass and write once; json.dump streams many tiny writes
+        payload = json.dumps({
+            "timestamp": report.timestamp,
+            "is_valid": report.validation_metrics.is_valid,
+            "violations": report.detailed_violations,
+            "performance": report.performance_summary,
+            "quality": report.quality_analysis
+        }, indent=2)
         with open(filepath, 'w') as f:
-            json.dump({
-                "timestamp": report.timestamp,
-                "is_valid": report.validation_metrics.is_valid,
-                "violations": report.detailed_violations,
-                "performance": report.performance_summary,
-                "quality": report.quality_analysis
-            }, f, indent=2)
+            f.write(payload)
     
     def _save_text_report(self, report: ValidationReport, filepath: str):
         """Save report in human-readable text format"""
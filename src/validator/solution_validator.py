@@ -1,6 +1,6 @@
 from dataclasses import dataclass
-from typing import Dict, List, Set
-from ..csp.variable import Variable, TimeSlot
+from typing import Dict, List
+from ..csp.variable import Variable
 from ..csp.constraints import ConstraintManager
 from ..csp.optimization import OptimizationMetrics, SolutionOptimizer
 
@@ -57,26 +57,20 @@ class SolutionValidator:
         """Calculate resource utilization percentages"""
         total_slots = len({var._assigned_time for var in variables})
         
-        # Room usage
-        room_usage: Dict[str, Set[TimeSlot]] = {}
-        for var in variables:
-            if var._assigned_room not in room_usage:
-                room_usage[var._assigned_room] = set()
-            room_usage[var._assigned_room].add(var._assigned_time)
-        
-        # Instructor usage
-        instructor_usage: Dict[str, Set[TimeSlot]] = {}
-        for var in variables:
-            if var._assigned_instructor not in instructor_usage:
-                instructor_usage[var._assigned_instructor] = set()
-            instructor_usage[var._assigned_instructor].add(var._assigned_time)
+        # Distinct (resource, slot) bookings; their count is the summed usage
+        room_bookings = {(var._assigned_room, var._assigned_time) for var in variables}
+        instructor_bookings = {
+            (var._assigned_instructor, var._assigned_time) for var in variables
+        }
+        room_count = len({room for room, _ in room_bookings})
+        instructor_count = len({instructor for instructor, _ in instructor_bookings})
         
         # Calculate percentages
         return {
-            'rooms': sum(len(slots) for slots in room_usage.values()) / 
-                    (len(room_usage) * total_slots) if room_usage else 0,
-            'instructors': sum(len(slots) for slots in instructor_usage.values()) / 
-                         (len(instructor_usage) * total_slots) if instructor_usage else 0
+            'rooms': len(room_bookings) / (room_count * total_slots)
+                     if room_count else 0,
+            'instructors': len(instructor_bookings) / (instructor_count * total_slots)
+                           if instructor_count else 0
         }
     
     def _analyze_level_distribution(self, 
@@ -80,6 +80,49 @@ class TestDatabaseManager(unittest.TestCase):
         self.assertTrue(result.success)
         self.assertEqual(result.rows_affected, 3)
 
+    def test_create_records(self):
+        records = [{'name': f'bulk{i}', 'value': i} for i in range(5)]
+        result = self.db_manager.create_records('test_table', records)
+        self.assertTrue(result.success)
+        self.assertEqual(result.rows_affected, 5)
+        
+        result = self.db_manager.read_records('test_table')
+        self.assertEqual(len(result.data), 5)
+        
+        # A failing row rolls back the whole batch
+        result = self.db_manager.create_records(
+            'test_table',
+            [{'name': 'ok', 'value': 1}, {'name': None, 'value': 2}]
+        )
+        self.assertFalse(result.success)
+        result = self.db_manager.read_records('test_table')
+        self.assertEqual(len(result.data), 5)
+        
+        # Records with differing columns are rejected, not half-inserted
+        result = self.db_manager.create_records(
+            'test_table',
+            [{'name': 'a', 'value': 1}, {'name': 'b'}]
+        )
+        self.assertFalse(result.success)
+        self.assertIsNotNone(result.error)
+        result = self.db_manager.read_records('test_table')
+        self.assertEqual(len(result.data), 5)
+
+    def test_create_record_skip_duplicates(self):
+        record = {'id': 1, 'name': 'dup', 'value': 1}
+        result = self.db_manager.create_record('test_table', record)
+        self.assertTrue(result.success)
+        
+        # Without the flag the primary key clash is an error
+        result = self.db_manager.create_record('test_table', record)
+        self.assertFalse(result.success)
+        
+        result = self.db_manager.create_record(
+            'test_table', record, skip_duplicates=True
+        )
+        self.assertTrue(result.success)
+        self.assertEqual(result.rows_affected, 0)
+
     def test_transaction(self):
         # Test successful transaction
         queries = [
@@ -94,6 +137,17 @@ class TestDatabaseManager(unittest.TestCase):
         # Verify transaction
         result = self.db_manager.read_records('test_table')
         self.assertEqual(len(result.data), 2)
+        self.assertEqual(result.rows_affected, 2)
+
+    def test_read_inside_connection(self):
+        # Reads inside an open transaction see its uncommitted writes
+        with self.db_manager.connection() as conn:
+            conn.execute("INSERT INTO test_table (name, value) VALUES ('pending', 1)")
+            result = self.db_manager.read_records('test_table', {'name': 'pending'})
+            self.assertEqual(len(result.data), 1)
+
+        result = self.db_manager.read_records('test_table', {'name': 'pending'})
+        self.assertEqual(len(result.data), 1)
 
     def tearDown(self):
         self.db_file.close()
\ No newline at end of file
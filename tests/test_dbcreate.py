@@ -0,0 +1,106 @@
+import unittest
+import tempfile
+import os
+import sqlite3
+from dbcreate.db import create_database, db_session, load_data, _LOOKUP_INDEXES
+from src.database.query_optimizer import TIMETABLE_INDICES
+
+CSV_HEADER = "course_id,course_name,credits,course_type,Space,Capacity,Type,Day,start_time,end_time\n"
+
+class TestLoadData(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp_dir.name, 'timetable.db')
+        self.csv_path = os.path.join(self.tmp_dir.name, 'data.csv')
+        with open(self.csv_path, 'w', newline='') as f:
+            f.write(CSV_HEADER)
+            f.write("CSC111,Intro,3,Lecture,R101,40,Lecture,Monday,9:00,10:30\n")
+
+    def test_load_inside_caller_transaction(self):
+        with db_session(self.db_path) as conn:
+            conn.execute("INSERT INTO rooms (room_id, room_type) VALUES ('R200', 'Lab')")
+            load_data(self.csv_path, conn=conn)
+            # load_data leaves the commit to db_session
+            self.assertTrue(conn.in_transaction)
+
+        with db_session(self.db_path) as conn:
+            rooms = {row[0] for row in conn.execute("SELECT room_id FROM rooms")}
+            self.assertEqual(rooms, {'R101', 'R200'})
+            self.assertEqual(
+                conn.execute("SELECT start_min, end_min FROM timetable").fetchall(),
+                [(540, 630)] * 4
+            )
+
+    def test_failed_load_keeps_caller_writes(self):
+        with db_session(self.db_path) as conn:
+            conn.execute("INSERT INTO rooms (room_id, room_type) VALUES ('R200', 'Lab')")
+            with self.assertRaises(FileNotFoundError):
+                load_data(os.path.join(self.tmp_dir.name, 'missing.csv'), conn=conn)
+
+        with db_session(self.db_path) as conn:
+            rooms = [row[0] for row in conn.execute("SELECT room_id FROM rooms")]
+            self.assertEqual(rooms, ['R200'])
+
+    def test_failed_bulk_load_leaves_no_keyless_tables(self):
+        with self.assertRaises(FileNotFoundError):
+            load_data(os.path.join(self.tmp_dir.name, 'missing.csv'), self.db_path,
+                      bulk_load=True)
+        conn = sqlite3.connect(self.db_path)
+        tables = conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'").fetchall()
+        conn.close()
+        self.assertEqual(tables, [])
+
+        # a later load builds the keyed schema, so reloading does not duplicate rows
+        load_data(self.csv_path, self.db_path)
+        load_data(self.csv_path, self.db_path, bulk_load=True)
+        with db_session(self.db_path) as conn:
+            self.assertEqual(conn.execute("SELECT COUNT(*) FROM rooms").fetchone(), (1,))
+
+    def test_load_builds_timetable_indexes(self):
+        # Same set as the app's QueryOptimizer, so the two never overlap
+        timetable_indexes = [index for index in _LOOKUP_INDEXES
+                             if index[1].startswith('timetable(')]
+        self.assertEqual(timetable_indexes, TIMETABLE_INDICES)
+
+        load_data(self.csv_path, self.db_path)
+        with db_session(self.db_path) as conn:
+            indexes = {row[0] for row in conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'timetable'"
+            )}
+        self.assertTrue({name for name, _ in TIMETABLE_INDICES} <= indexes)
+
+    def test_minute_columns_backfilled_once(self):
+        conn = sqlite3.connect(self.db_path)
+        conn.execute('''
+            CREATE TABLE timetable (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                day TEXT NOT NULL,
+                start_time TEXT NOT NULL,
+                end_time TEXT NOT NULL,
+                level INTEGER,
+                room_id TEXT,
+                course_id TEXT,
+                instructor_id TEXT
+            )''')
+        conn.execute("INSERT INTO timetable (day, start_time, end_time) "
+                     "VALUES ('Monday', '9:00', '10:30')")
+        conn.commit()
+        conn.close()
+
+        conn = create_database(self.db_path)
+        self.assertEqual(
+            conn.execute("SELECT start_min, end_min, slot_mask FROM timetable").fetchall(),
+            [(540, 630, 0b111 << 18)]
+        )
+        conn.close()
+
+        # Already migrated: opening again writes nothing
+        conn = create_database(self.db_path)
+        self.assertEqual(conn.total_changes, 0)
+        conn.close()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -72,6 +72,27 @@ class TestDomain(unittest.TestCase):
         self.assertEqual(len(rooms), 1)
         self.assertEqual(len(instructors), 1)
         
+    def test_available_times_follow_in_place_changes(self):
+        requirements = ResourceRequirements(room_type="Lecture", min_capacity=25)
+        before, _, _ = self.domain.get_available_values(requirements)
+
+        slot = TimeSlot(day="Tuesday", start_time=time(11, 0), end_time=time(12, 30))
+        self.domain.time_slots.append(slot)
+        times, _, _ = self.domain.get_available_values(requirements)
+
+        self.assertIn(slot, times)
+        self.assertEqual(len(times), len(before) + 1)
+
+    def test_invalidate_after_replacing_room(self):
+        self.domain.rooms = {"R101": RoomAvailability("R101", "Lecture", 30)}
+        self.assertEqual(self.domain.suitable_rooms("Lecture", 25), frozenset({"R101"}))
+
+        # Same dict, same size: only an explicit invalidate() shows the change
+        self.domain.rooms["R101"] = RoomAvailability("R101", "Lab", 30)
+        self.domain.invalidate()
+        self.assertEqual(self.domain.suitable_rooms("Lecture", 25), frozenset())
+        self.assertEqual(self.domain.rooms_of_type("Lab"), frozenset({"R101"}))
+
     def test_availability_updates(self):
         time_slot = next(iter(self.domain.time_slots))
         room_id = "R101"
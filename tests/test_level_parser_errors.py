@@ -71,6 +71,17 @@ class TestLevelParserErrors(unittest.TestCase):
         with self.assertRaises(ConstraintViolationError):
             parser.load_levels()
 
+    def test_constraint_error_carries_messages(self):
+        errors = ["Duplicate courses found in level level_1",
+                  "Courses {'CSC111'} appear in multiple levels"]
+        error = ConstraintViolationError("validation", "; ".join(errors), errors)
+        self.assertEqual(error.constraint, "validation")
+        self.assertEqual(error.errors, errors)
+        
+        # Without an explicit list the details form the single message
+        error = ConstraintViolationError("database", "locked")
+        self.assertEqual(error.errors, ["locked"])
+
     def tearDown(self):
         self.conn.close()
         self.db_file.close()
@@ -48,6 +48,28 @@ class TestQueryOptimizer(unittest.TestCase):
             self.assertTrue(any('idx_timetable_room' in idx for idx in indices))
             self.assertTrue(any('idx_timetable_day_time' in idx for idx in indices))
 
+    def test_index_migration_runs_once(self):
+        def index_names():
+            with sqlite3.connect(self.db_file.name) as conn:
+                cur = conn.cursor()
+                cur.execute("SELECT name FROM sqlite_master WHERE type='index'")
+                return {row[0] for row in cur.fetchall()}
+
+        with sqlite3.connect(self.db_file.name) as conn:
+            conn.execute("ALTER TABLE timetable ADD COLUMN level INTEGER")
+            conn.execute("CREATE INDEX idx_timetable_room ON timetable(room_id)")
+        QueryOptimizer(self.db_file.name).close()
+
+        indices = index_names()
+        self.assertIn('idx_timetable_level_day', indices)
+        self.assertNotIn('idx_timetable_room', indices)
+
+        # Later opens leave the schema alone
+        with sqlite3.connect(self.db_file.name) as conn:
+            conn.execute("CREATE INDEX idx_timetable_room ON timetable(room_id)")
+        QueryOptimizer(self.db_file.name).close()
+        self.assertIn('idx_timetable_room', index_names())
+
     def test_query_analysis(self):
         query = "SELECT * FROM timetable WHERE room_id = ?"
         stats = self.optimizer.analyze_query(query, ("R101",))
@@ -90,4 +90,33 @@ class TestScheduler(unittest.TestCase):
                 (var._assigned_room, var._assigned_time),
                 scheduled_slots
             )
-            scheduled_slots.add((var._assigned_room, var._assigned_time))
\ No newline at end of file
+            scheduled_slots.add((var._assigned_room, var._assigned_time))
+
+class TestResourceBookings(unittest.TestCase):
+    def setUp(self):
+        # Booking checks never consult the domain
+        self.scheduler = LevelScheduler(None)
+        self.scheduler._mark_resource_used(
+            'rooms', "R101", TimeSlot("Monday", time(9), time(10, 30))
+        )
+
+    def test_overlapping_booking_unavailable(self):
+        self.assertFalse(self.scheduler._is_resource_available(
+            'rooms', "R101", TimeSlot("Monday", time(10), time(11))
+        ))
+
+    def test_back_to_back_booking_available(self):
+        self.assertTrue(self.scheduler._is_resource_available(
+            'rooms', "R101", TimeSlot("Monday", time(10, 30), time(12))
+        ))
+        self.assertTrue(self.scheduler._is_resource_available(
+            'rooms', "R101", TimeSlot("Monday", time(8), time(9))
+        ))
+
+    def test_other_day_and_resource_available(self):
+        self.assertTrue(self.scheduler._is_resource_available(
+            'rooms', "R101", TimeSlot("Tuesday", time(9), time(10, 30))
+        ))
+        self.assertTrue(self.scheduler._is_resource_available(
+            'rooms', "R102", TimeSlot("Monday", time(9), time(10, 30))
+        ))
@@ -1,9 +1,12 @@
 import unittest
+import tempfile
+import sqlite3
 from datetime import time
 from src.csp.solver import Solver
 from src.csp.constraints import ConstraintManager
 from src.csp.variable import Variable, TimeSlot, ResourceRequirements
 from src.csp.domain import Domain, RoomAvailability, InstructorAvailability
+from src.database.database_manager import DatabaseManager
 
 class TestSolver(unittest.TestCase):
     def setUp(self):
@@ -88,4 +91,57 @@ class TestSolver(unittest.TestCase):
         success = self.solver.ac3([var1, var2])
         self.assertTrue(success)
         self.assertTrue(var1.domain_size() > 0)
-        self.assertTrue(var2.domain_size() > 0)
\ No newline at end of file
+        self.assertTrue(var2.domain_size() > 0)
+
+class TestPortfolioSolver(unittest.TestCase):
+    def setUp(self):
+        self.db_file = tempfile.NamedTemporaryFile()
+        with sqlite3.connect(self.db_file.name) as conn:
+            conn.executescript('''
+                CREATE TABLE timetable (
+                    id INTEGER PRIMARY KEY,
+                    day TEXT NOT NULL,
+                    start_time TEXT NOT NULL,
+                    end_time TEXT NOT NULL,
+                    level INTEGER
+                );
+                CREATE TABLE rooms (
+                    room_id TEXT PRIMARY KEY,
+                    room_type TEXT NOT NULL,
+                    room_capacity INTEGER
+                );
+                CREATE TABLE instructors (
+                    instructor_id TEXT PRIMARY KEY,
+                    instructor_name TEXT NOT NULL,
+                    preferred_slots TEXT
+                );
+                INSERT INTO rooms VALUES ('R101', 'Lecture', 30);
+                INSERT INTO instructors VALUES ('INS1', 'Dr. Smith', NULL);
+            ''')
+        
+        self.db_manager = DatabaseManager(self.db_file.name)
+        self.domain = Domain(self.db_manager)
+        self.domain.time_slots = [
+            TimeSlot("Monday", time(9), time(10)),
+            TimeSlot("Monday", time(10), time(11))
+        ]
+        self.solver = Solver(ConstraintManager(self.domain), self.domain)
+    
+    def test_solve_portfolio(self):
+        requirements = ResourceRequirements("Lecture", 30)
+        variables = [Variable("CSC111", 1, requirements), Variable("CSC112", 1, requirements)]
+        for var in variables:
+            var.set_domain(*self.domain.get_available_values(requirements))
+        
+        # The domain (without its database handle) is pickled to the workers
+        solutions = self.solver.solve_portfolio(variables, workers=2, timeout=30)
+        
+        self.assertEqual(len(solutions), 1)
+        first, second = solutions[0]
+        self.assertTrue(first.is_assigned and second.is_assigned)
+        self.assertFalse(first.conflicts_with(second))
+        self.assertIsNotNone(self.solver.best_metrics)
+        self.assertIsNotNone(self.domain.db_manager)
+    
+    def tearDown(self):
+        self.db_file.close()
@@ -41,6 +41,20 @@ class TestSpecificConstraints(unittest.TestCase):
         self.assertTrue(any(v.constraint_type == "instructor_conflict" 
                           for v in violations))
         
+    def test_resource_conflict_with_booking_in_between(self):
+        constraint = ResourceConflictConstraint()
+        var3 = Variable("CSC113", 1, self.requirements)
+
+        # R101 clash separated by a booking of another room in the variable order
+        self.var1.assign(TimeSlot("Monday", time(9), time(10, 30)), "R101", "INS1")
+        self.var2.assign(TimeSlot("Monday", time(9, 30), time(10)), "R102", "INS2")
+        var3.assign(TimeSlot("Monday", time(10), time(11)), "R101", "INS3")
+
+        violations = constraint.check([self.var1, self.var2, var3], None)
+        self.assertEqual(len(violations), 1)
+        self.assertEqual(violations[0].constraint_type, "room_conflict")
+        self.assertEqual(set(violations[0].variables), {self.var1, var3})
+
     def test_time_conflict_constraint(self):
         constraint = TimeConflictConstraint()
         
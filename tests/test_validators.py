@@ -1,6 +1,9 @@
 import unittest
 import tempfile
 import sqlite3
+import os
+import shutil
+from contextlib import closing
 from src.database.validators import SchemaValidator, RelationshipValidator
 
 class TestValidators(unittest.TestCase):
@@ -41,6 +44,48 @@ class TestValidators(unittest.TestCase):
         self.assertTrue(any("Missing required table" in err 
                           for err in result.errors))
 
+    def test_schema_validation_cache(self):
+        first = self.schema_validator.validate_schema()
+        first.errors.clear()  # callers get their own copy
+        cached = self.schema_validator.validate_schema()
+        self.assertFalse(cached.is_valid)
+        self.assertIn("Missing required table: rooms", cached.errors)
+
+        # DDL bumps schema_version, so the cached result is dropped
+        self.cur.execute('''
+            CREATE TABLE rooms (
+                room_id TEXT PRIMARY KEY,
+                room_type TEXT NOT NULL,
+                room_capacity INTEGER
+            )
+        ''')
+        self.conn.commit()
+        result = self.schema_validator.validate_schema()
+        self.assertNotIn("Missing required table: rooms", result.errors)
+        self.assertIn("Missing required table: instructors", result.errors)
+
+    def test_schema_validation_recreated_file(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'schema.db')
+            with closing(sqlite3.connect(path)) as conn:
+                conn.execute("CREATE TABLE courses (course_id TEXT PRIMARY KEY)")
+            validator = SchemaValidator(path)
+            self.assertIn("Missing required table: rooms", validator.validate_schema().errors)
+
+            # Overwritten in place: same inode and the same low schema_version
+            other = os.path.join(tmp_dir, 'other.db')
+            with closing(sqlite3.connect(other)) as conn:
+                conn.execute("CREATE TABLE rooms (room_id TEXT PRIMARY KEY)")
+            shutil.copyfile(other, path)
+            result = validator.validate_schema()
+            self.assertNotIn("Missing required table: rooms", result.errors)
+            self.assertIn("Missing required table: courses", result.errors)
+
+    def test_schema_validation_in_memory(self):
+        result = SchemaValidator(':memory:').validate_schema()
+        self.assertFalse(result.is_valid)
+        self.assertEqual(len(result.errors), len(SchemaValidator.EXPECTED_TABLES))
+
     def test_relationship_validation(self):
         # Insert test data with invalid foreign key
         self.cur.execute(